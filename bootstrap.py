@@ -0,0 +1,15 @@
+# bootstrap.py
+import logging
+import os
+from dotenv import load_dotenv
+
+# Load .env exactly once; modules that read settings at import time import this first
+load_dotenv()
+
+# App loggers; debug output (per-request search URLs/counts) only shows with LOG_LEVEL=DEBUG
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+# httpx logs every outbound request at INFO; keep that off the hot path unless debugging
+logging.getLogger("httpx").setLevel(max(logging.getLogger().level, logging.WARNING))
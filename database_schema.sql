@@ -24,9 +24,15 @@ CREATE TABLE IF NOT EXISTS feed_subscriptions (
     description TEXT DEFAULT '',
     last_updated TIMESTAMPTZ DEFAULT NOW(),
     is_active BOOLEAN DEFAULT TRUE,
-    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    etag TEXT,
+    last_modified TEXT
 );
 
+-- Existing installs: HTTP validators for conditional feed refreshes
+ALTER TABLE feed_subscriptions ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE feed_subscriptions ADD COLUMN IF NOT EXISTS last_modified TEXT;
+
 -- Create articles table
 CREATE TABLE IF NOT EXISTS articles (
     id TEXT PRIMARY KEY,
@@ -40,9 +46,14 @@ CREATE TABLE IF NOT EXISTS articles (
     content TEXT,
     author TEXT,
     tags TEXT[] DEFAULT '{}',
-    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    date_ts BIGINT DEFAULT 0
 );
 
+-- Existing installs: add the numeric sort key and backfill it from `date`
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS date_ts BIGINT DEFAULT 0;
+UPDATE articles SET date_ts = EXTRACT(EPOCH FROM date)::BIGINT WHERE date_ts = 0 AND date IS NOT NULL;
+
 -- Create documents table
 CREATE TABLE IF NOT EXISTS documents (
     id TEXT PRIMARY KEY,
@@ -66,6 +77,7 @@ CREATE INDEX IF NOT EXISTS idx_feed_subscriptions_is_active ON feed_subscription
 
 CREATE INDEX IF NOT EXISTS idx_articles_user_id ON articles(user_id);
 CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_date_ts ON articles(date_ts DESC);
 CREATE INDEX IF NOT EXISTS idx_articles_feed_id ON articles(feed_id);
 CREATE INDEX IF NOT EXISTS idx_articles_title_search ON articles USING gin(to_tsvector('english', title));
 
@@ -134,7 +146,10 @@ CREATE POLICY "Users can delete their own documents" ON documents
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
-    NEW.updated_at = NOW();
+    -- Only user edits count; background keyword refreshes must not reorder entries
+    IF NEW.title IS DISTINCT FROM OLD.title OR NEW.content IS DISTINCT FROM OLD.content THEN
+        NEW.updated_at = NOW();
+    END IF;
     RETURN NEW;
 END;
 $$ language 'plpgsql';
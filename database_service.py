@@ -1,8 +1,12 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-import uuid
-from supabase_config import supabase, TABLES
-from pydantic import BaseModel
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timezone
+import logging
+import secrets
+from supabase import Client
+from supabase_config import get_supabase, TABLES
+from pydantic import BaseModel, model_validator
+
+log = logging.getLogger(__name__)
 
 # Pydantic models for database operations
 class JournalEntry(BaseModel):
@@ -12,7 +16,7 @@ class JournalEntry(BaseModel):
     created_at: str
     updated_at: str
     word_count: int
-    keywords: Optional[Dict[str, int]] = {}
+    keywords: Optional[Dict[str, Union[int, float]]] = {}  # raw counts or TF-IDF scores
     user_id: Optional[str] = None
 
 class FeedSubscription(BaseModel):
@@ -23,6 +27,12 @@ class FeedSubscription(BaseModel):
     last_updated: str
     is_active: bool = True
     user_id: Optional[str] = None
+    # HTTP validators from the last fetch, sent back as a conditional GET
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+# Feed subscription fields that may be changed after creation
+FEED_UPDATE_FIELDS = ('url', 'title', 'description', 'last_updated', 'is_active', 'etag', 'last_modified')
 
 class Article(BaseModel):
     id: str
@@ -37,6 +47,17 @@ class Article(BaseModel):
     author: Optional[str] = None
     tags: Optional[List[str]] = []
     user_id: Optional[str] = None
+    date_ts: int = 0  # unix seconds, numeric sort key for `date`
+
+    @model_validator(mode='after')
+    def _fill_date_ts(self):
+        # Rows written before date_ts existed only carry the ISO date
+        if not self.date_ts and self.date:
+            try:
+                self.date_ts = int(datetime.fromisoformat(self.date[:10]).replace(tzinfo=timezone.utc).timestamp())
+            except ValueError:
+                pass
+        return self
 
 class Document(BaseModel):
     id: str
@@ -51,21 +72,34 @@ class Document(BaseModel):
 class DatabaseService:
     """Service class to handle all database operations with Supabase"""
     
-    def __init__(self):
-        self.supabase = supabase
+    def __init__(self, client: Optional[Client] = None):
+        # None means the shared client; background jobs pass a user or service-role client
+        self._client = client
+    
+    @property
+    def supabase(self):
+        # Resolved lazily so the client is only built once a query actually runs
+        return self._client or get_supabase()
     
     # Journal operations
     def get_all_journals(self, user_id: Optional[str] = None) -> List[JournalEntry]:
         """Get all journal entries, optionally filtered by user_id"""
+        return [JournalEntry(**journal) for journal in self.get_all_journals_raw(user_id)]
+    
+    def get_all_journals_raw(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get journal entries as plain rows, skipping model validation; limit/offset page the result"""
         try:
             query = self.supabase.table(TABLES['journals']).select("*")
             if user_id:
                 query = query.eq('user_id', user_id)
             
-            result = query.order('updated_at', desc=True).execute()
-            return [JournalEntry(**journal) for journal in result.data]
+            query = query.order('updated_at', desc=True)
+            if limit is not None:
+                query = query.range(offset, offset + limit - 1)
+            result = query.execute()
+            return result.data
         except Exception as e:
-            print(f"Error fetching journals: {e}")
+            log.error("Error fetching journals: %s", e)
             return []
     
     def get_journal(self, journal_id: str) -> Optional[JournalEntry]:
@@ -76,14 +110,15 @@ class DatabaseService:
                 return JournalEntry(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error fetching journal {journal_id}: {e}")
+            log.error("Error fetching journal %s: %s", journal_id, e)
             return None
     
     def create_journal(self, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
         """Create a new journal entry"""
         try:
-            journal_id = f"j_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
-            now = datetime.now().isoformat()
+            created = datetime.now()
+            journal_id = f"j_{int(created.timestamp())}_{secrets.token_hex(4)}"
+            now = created.isoformat()
             
             journal_entry = {
                 'id': journal_id,
@@ -101,7 +136,7 @@ class DatabaseService:
                 return JournalEntry(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error creating journal: {e}")
+            log.error("Error creating journal: %s", e)
             return None
     
     def update_journal(self, journal_id: str, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
@@ -124,16 +159,25 @@ class DatabaseService:
                 return JournalEntry(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error updating journal {journal_id}: {e}")
+            log.error("Error updating journal %s: %s", journal_id, e)
             return None
     
+    def update_journal_keywords(self, journal_id: str, keywords: Dict[str, float]) -> bool:
+        """Replace only the keywords of a journal entry"""
+        try:
+            self.supabase.table(TABLES['journals']).update({'keywords': keywords}).eq('id', journal_id).execute()
+            return True
+        except Exception as e:
+            log.error("Error updating keywords for journal %s: %s", journal_id, e)
+            return False
+    
     def delete_journal(self, journal_id: str) -> bool:
         """Delete a journal entry"""
         try:
             result = self.supabase.table(TABLES['journals']).delete().eq('id', journal_id).execute()
             return True
         except Exception as e:
-            print(f"Error deleting journal {journal_id}: {e}")
+            log.error("Error deleting journal %s: %s", journal_id, e)
             return False
     
     def search_journals(self, query: str, user_id: Optional[str] = None) -> List[JournalEntry]:
@@ -149,7 +193,7 @@ class DatabaseService:
             result = search_query.or_(f"title.ilike.%{query}%,content.ilike.%{query}%").execute()
             return [JournalEntry(**journal) for journal in result.data]
         except Exception as e:
-            print(f"Error searching journals: {e}")
+            log.error("Error searching journals: %s", e)
             return []
     
     # Feed operations
@@ -163,14 +207,15 @@ class DatabaseService:
             result = query.execute()
             return [FeedSubscription(**feed) for feed in result.data]
         except Exception as e:
-            print(f"Error fetching feed subscriptions: {e}")
+            log.error("Error fetching feed subscriptions: %s", e)
             return []
     
     def create_feed_subscription(self, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
         """Create a new feed subscription"""
         try:
-            feed_id = f"feed_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
-            now = datetime.now().isoformat()
+            created = datetime.now()
+            feed_id = f"feed_{int(created.timestamp())}_{secrets.token_hex(4)}"
+            now = created.isoformat()
             
             subscription = {
                 'id': feed_id,
@@ -179,7 +224,9 @@ class DatabaseService:
                 'description': feed_data.get('description', ''),
                 'last_updated': now,
                 'is_active': feed_data.get('is_active', True),
-                'user_id': feed_data.get('user_id')
+                'user_id': feed_data.get('user_id'),
+                'etag': feed_data.get('etag'),
+                'last_modified': feed_data.get('last_modified')
             }
             
             result = self.supabase.table(TABLES['feed_subscriptions']).insert(subscription).execute()
@@ -187,7 +234,34 @@ class DatabaseService:
                 return FeedSubscription(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error creating feed subscription: {e}")
+            log.error("Error creating feed subscription: %s", e)
+            return None
+    
+    def get_feed_subscription(self, subscription_id: str) -> Optional[FeedSubscription]:
+        """Get a specific feed subscription by ID"""
+        try:
+            result = self.supabase.table(TABLES['feed_subscriptions']).select("*").eq('id', subscription_id).execute()
+            if result.data:
+                return FeedSubscription(**result.data[0])
+            return None
+        except Exception as e:
+            log.error("Error fetching feed subscription %s: %s", subscription_id, e)
+            return None
+    
+    def update_feed_subscription(self, subscription_id: str, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
+        """Update fields of an existing feed subscription"""
+        try:
+            update_data = {
+                field: feed_data[field]
+                for field in FEED_UPDATE_FIELDS
+                if field in feed_data
+            }
+            result = self.supabase.table(TABLES['feed_subscriptions']).update(update_data).eq('id', subscription_id).execute()
+            if result.data:
+                return FeedSubscription(**result.data[0])
+            return None
+        except Exception as e:
+            log.error("Error updating feed subscription %s: %s", subscription_id, e)
             return None
     
     def delete_feed_subscription(self, subscription_id: str) -> bool:
@@ -196,70 +270,111 @@ class DatabaseService:
             result = self.supabase.table(TABLES['feed_subscriptions']).delete().eq('id', subscription_id).execute()
             return True
         except Exception as e:
-            print(f"Error deleting feed subscription {subscription_id}: {e}")
+            log.error("Error deleting feed subscription %s: %s", subscription_id, e)
             return False
     
     # Article operations
-    def get_all_articles(self, user_id: Optional[str] = None) -> List[Article]:
-        """Get all articles"""
+    def get_all_articles(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                         exclude_feeds: Optional[List[str]] = None) -> List[Article]:
+        """Get all articles newest first, skipping those of exclude_feeds; limit/offset page the result"""
         try:
             query = self.supabase.table(TABLES['articles']).select("*")
             if user_id:
                 query = query.eq('user_id', user_id)
+            if exclude_feeds:
+                # Articles without a feed stay visible, as NOT IN alone would drop them
+                feed_list = ",".join(f'"{feed_id}"' for feed_id in exclude_feeds)
+                query = query.or_(f"feed_id.is.null,feed_id.not.in.({feed_list})")
             
-            result = query.order('date', desc=True).execute()
+            query = query.order('date_ts', desc=True)
+            if limit is not None:
+                query = query.range(offset, offset + limit - 1)
+            result = query.execute()
             return [Article(**article) for article in result.data]
         except Exception as e:
-            print(f"Error fetching articles: {e}")
+            log.error("Error fetching articles: %s", e)
             return []
     
+    def get_article_urls(self, user_id: Optional[str] = None) -> set:
+        """Get the URLs of stored articles (only the url column is fetched)"""
+        try:
+            query = self.supabase.table(TABLES['articles']).select("url")
+            if user_id:
+                query = query.eq('user_id', user_id)
+            
+            result = query.execute()
+            return {row['url'] for row in result.data if row.get('url')}
+        except Exception as e:
+            log.error("Error fetching article urls: %s", e)
+            return set()
+    
+    def _article_row(self, article_data: Dict[str, Any], created: datetime) -> Dict[str, Any]:
+        return {
+            'id': f"article_{int(created.timestamp())}_{secrets.token_hex(4)}",
+            'title': article_data.get('title', ''),
+            'source': article_data.get('source', ''),
+            'snippet': article_data.get('snippet', ''),
+            'date': article_data.get('date', created.date().isoformat()),
+            'type': article_data.get('type', 'rss'),
+            'url': article_data.get('url'),
+            'feed_id': article_data.get('feed_id'),
+            'content': article_data.get('content'),
+            'author': article_data.get('author'),
+            'tags': article_data.get('tags', []),
+            'user_id': article_data.get('user_id'),
+            'date_ts': article_data.get('date_ts', int(created.timestamp()))
+        }
+    
     def create_article(self, article_data: Dict[str, Any]) -> Optional[Article]:
         """Create a new article"""
         try:
-            article_id = f"article_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
-            
-            article = {
-                'id': article_id,
-                'title': article_data.get('title', ''),
-                'source': article_data.get('source', ''),
-                'snippet': article_data.get('snippet', ''),
-                'date': article_data.get('date', datetime.now().isoformat().split('T')[0]),
-                'type': article_data.get('type', 'rss'),
-                'url': article_data.get('url'),
-                'feed_id': article_data.get('feed_id'),
-                'content': article_data.get('content'),
-                'author': article_data.get('author'),
-                'tags': article_data.get('tags', []),
-                'user_id': article_data.get('user_id')
-            }
+            article = self._article_row(article_data, datetime.now())
             
             result = self.supabase.table(TABLES['articles']).insert(article).execute()
             if result.data:
                 return Article(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error creating article: {e}")
+            log.error("Error creating article: %s", e)
             return None
     
+    def create_articles(self, articles_data: List[Dict[str, Any]]) -> List[Article]:
+        """Create many articles with a single insert request"""
+        if not articles_data:
+            return []
+        try:
+            created = datetime.now()
+            articles = [self._article_row(article_data, created) for article_data in articles_data]
+            
+            result = self.supabase.table(TABLES['articles']).insert(articles).execute()
+            return [Article(**article) for article in result.data]
+        except Exception as e:
+            log.error("Error creating articles: %s", e)
+            return []
+    
     # Document operations
-    def get_all_documents(self, user_id: Optional[str] = None) -> List[Document]:
-        """Get all documents"""
+    def get_all_documents(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Document]:
+        """Get all documents; limit/offset page the result"""
         try:
             query = self.supabase.table(TABLES['documents']).select("*")
             if user_id:
                 query = query.eq('user_id', user_id)
             
-            result = query.order('upload_date', desc=True).execute()
+            query = query.order('upload_date', desc=True)
+            if limit is not None:
+                query = query.range(offset, offset + limit - 1)
+            result = query.execute()
             return [Document(**doc) for doc in result.data]
         except Exception as e:
-            print(f"Error fetching documents: {e}")
+            log.error("Error fetching documents: %s", e)
             return []
     
     def create_document(self, document_data: Dict[str, Any]) -> Optional[Document]:
         """Create a new document"""
         try:
-            doc_id = f"doc_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
-            now = datetime.now().isoformat()
+            created = datetime.now()
+            doc_id = f"doc_{int(created.timestamp())}_{secrets.token_hex(4)}"
+            now = created.isoformat()
             
             document = {
                 'id': doc_id,
@@ -277,7 +392,18 @@ class DatabaseService:
                 return Document(**result.data[0])
             return None
         except Exception as e:
-            print(f"Error creating document: {e}")
+            log.error("Error creating document: %s", e)
+            return None
+    
+    def get_document(self, document_id: str) -> Optional[Document]:
+        """Get a specific document by ID"""
+        try:
+            result = self.supabase.table(TABLES['documents']).select("*").eq('id', document_id).execute()
+            if result.data:
+                return Document(**result.data[0])
+            return None
+        except Exception as e:
+            log.error("Error fetching document %s: %s", document_id, e)
             return None
     
     def delete_document(self, document_id: str) -> bool:
@@ -286,7 +412,7 @@ class DatabaseService:
             result = self.supabase.table(TABLES['documents']).delete().eq('id', document_id).execute()
             return True
         except Exception as e:
-            print(f"Error deleting document {document_id}: {e}")
+            log.error("Error deleting document %s: %s", document_id, e)
             return False
 
 # Global database service instance
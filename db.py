@@ -0,0 +1,343 @@
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+import orjson
+from database_service import JournalEntry, Article, Document
+
+log = logging.getLogger(__name__)
+
+DB_PATH = os.getenv("READNEST_DB_PATH", "readnest.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journals (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT DEFAULT '',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    word_count INTEGER DEFAULT 0,
+    keywords TEXT DEFAULT '{}',
+    user_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_journals_user_updated ON journals(user_id, updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    snippet TEXT DEFAULT '',
+    date TEXT NOT NULL,
+    type TEXT DEFAULT 'rss',
+    url TEXT,
+    feed_id TEXT,
+    content TEXT,
+    author TEXT,
+    tags TEXT DEFAULT '[]',
+    user_id TEXT,
+    date_ts INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_articles_user_date ON articles(user_id, date_ts DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    size INTEGER DEFAULT 0,
+    upload_date TEXT NOT NULL,
+    content TEXT,
+    status TEXT DEFAULT 'ready',
+    user_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_documents_user_upload ON documents(user_id, upload_date DESC);
+"""
+
+# Full-text indexes (external content, kept in sync by triggers)
+FTS_COLUMNS = {
+    'journals': ['title', 'content'],
+    'articles': ['title', 'snippet', 'content', 'tags'],
+    'documents': ['name', 'content'],
+}
+
+JSON_COLUMNS = {
+    'journals': {'keywords'},
+    'articles': {'tags'},
+    'documents': set(),
+}
+
+MODELS = {
+    'journals': JournalEntry,
+    'articles': Article,
+    'documents': Document,
+}
+
+def _fts_schema(table: str, columns: List[str]) -> str:
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+    {cols}, content='{table}', content_rowid='rowid', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO {table}_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+    INSERT INTO {table}_fts({table}_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {cols} ON {table} BEGIN
+    INSERT INTO {table}_fts({table}_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+    INSERT INTO {table}_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+END;
+"""
+
+def to_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word as a quoted prefix term, all required"""
+    terms = [t.replace('"', '""') for t in query.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+class SQLiteStore:
+    """
+    Local SQLite store used when Supabase is unavailable; search goes through FTS5
+    """
+
+    def __init__(self, path: str = DB_PATH, seed_files: Optional[Dict[str, str]] = None):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # One shared connection, serialised across the FastAPI threadpool
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA + "".join(_fts_schema(t, c) for t, c in FTS_COLUMNS.items()))
+        self._import_json(seed_files or {})
+
+    def _import_json(self, seed_files: Dict[str, str]):
+        """One-time import of the old JSON fallback files into empty tables"""
+        for table, path in seed_files.items():
+            if not os.path.exists(path) or self._count(table):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    rows = orjson.loads(f.read())
+                self._upsert(table, [MODELS[table](**row).model_dump() for row in rows])
+            except Exception as e:
+                log.warning("Skipping import of %s: %s", path, e)
+
+    # Row helpers
+    def _count(self, table: str) -> int:
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def _encode(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        json_columns = JSON_COLUMNS[table]
+        return {k: orjson.dumps(v).decode() if k in json_columns else v for k, v in data.items()}
+
+    def _decode(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        for column in JSON_COLUMNS[table]:
+            if data.get(column) is not None:
+                data[column] = orjson.loads(data[column])
+        return data
+
+    def _upsert(self, table: str, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        rows = [self._encode(table, row) for row in rows]
+        columns = list(rows[0].keys())
+        placeholders = ", ".join(f":{c}" for c in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != 'id')
+        # ON CONFLICT ... DO UPDATE keeps the rowid, so the FTS update trigger fires
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) ON CONFLICT(id) DO UPDATE SET {updates}"
+        with self._lock, self.conn:
+            self.conn.executemany(sql, rows)
+
+    def _select(self, table: str, where: str = "", params: tuple = (), order: str = "",
+                limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = (*params, limit, offset)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._decode(table, row) for row in rows]
+
+    def _select_for_user(self, table: str, user_id: Optional[str], order: str,
+                         limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        # Rows imported from the JSON files have no owner and stay visible to everyone
+        if user_id:
+            return self._select(table, "user_id = ? OR user_id IS NULL", (user_id,), order, limit, offset)
+        return self._select(table, order=order, limit=limit, offset=offset)
+
+    def _search(self, table: str, query: str, user_id: Optional[str]) -> List[Dict[str, Any]]:
+        match = to_match_query(query)
+        if not match:
+            return []
+        sql = f"SELECT t.* FROM {table}_fts f JOIN {table} t ON t.rowid = f.rowid WHERE {table}_fts MATCH ?"
+        params = [match]
+        if user_id:
+            sql += " AND (t.user_id = ? OR t.user_id IS NULL)"
+            params.append(user_id)
+        sql += " ORDER BY f.rank"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._decode(table, row) for row in rows]
+
+    def _delete(self, table: str, row_id: str) -> bool:
+        with self._lock, self.conn:
+            self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+        return True
+
+    # Journal operations
+    def get_all_journals_raw(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        return self._select_for_user('journals', user_id, "updated_at DESC", limit, offset)
+
+    def get_all_journals(self, user_id: Optional[str] = None) -> List[JournalEntry]:
+        return [JournalEntry(**row) for row in self.get_all_journals_raw(user_id)]
+
+    def get_journal(self, journal_id: str) -> Optional[JournalEntry]:
+        rows = self._select('journals', "id = ?", (journal_id,))
+        return JournalEntry(**rows[0]) if rows else None
+
+    def create_journal(self, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
+        created = datetime.now()
+        now = created.isoformat()
+        new_journal = JournalEntry(
+            id=f"j_{int(created.timestamp())}_{secrets.token_hex(4)}",
+            title=journal_data.get('title', ''),
+            content=journal_data.get('content', ''),
+            created_at=now,
+            updated_at=now,
+            word_count=journal_data.get('word_count', len(journal_data.get('content', '').split())),
+            keywords=journal_data.get('keywords', {}),
+            user_id=journal_data.get('user_id')
+        )
+        self._upsert('journals', [new_journal.model_dump()])
+        return new_journal
+
+    def update_journal(self, journal_id: str, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
+        journal = self.get_journal(journal_id)
+        if not journal:
+            return None
+
+        if 'title' in journal_data:
+            journal.title = journal_data['title']
+        if 'content' in journal_data:
+            journal.content = journal_data['content']
+            journal.word_count = journal_data.get('word_count', len(journal.content.split()))
+        journal.keywords = journal_data.get('keywords', journal.keywords)
+        journal.updated_at = datetime.now().isoformat()
+
+        self._upsert('journals', [journal.model_dump()])
+        return journal
+
+    def update_journal_keywords(self, journal_id: str, keywords: Dict[str, float]) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE journals SET keywords = ? WHERE id = ?", (orjson.dumps(keywords).decode(), journal_id)
+            )
+        return cursor.rowcount > 0
+
+    def delete_journal(self, journal_id: str) -> bool:
+        return self._delete('journals', journal_id)
+
+    def search_journals(self, query: str, user_id: Optional[str] = None) -> List[JournalEntry]:
+        return [JournalEntry(**row) for row in self._search('journals', query, user_id)]
+
+    # Article operations
+    def get_all_articles(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                         exclude_feeds: Optional[List[str]] = None) -> List[Article]:
+        if not exclude_feeds:
+            return [Article(**row) for row in self._select_for_user('articles', user_id, "date_ts DESC", limit, offset)]
+        # Articles without a feed stay visible, as NOT IN alone would drop them
+        where = f"(feed_id IS NULL OR feed_id NOT IN ({', '.join('?' * len(exclude_feeds))}))"
+        params = tuple(exclude_feeds)
+        if user_id:
+            where = f"(user_id = ? OR user_id IS NULL) AND {where}"
+            params = (user_id, *params)
+        return [Article(**row) for row in self._select('articles', where, params, "date_ts DESC", limit, offset)]
+
+    def get_article_urls(self, user_id: Optional[str] = None) -> set:
+        sql = "SELECT url FROM articles WHERE url IS NOT NULL"
+        params = ()
+        if user_id:
+            sql += " AND (user_id = ? OR user_id IS NULL)"
+            params = (user_id,)
+        with self._lock:
+            return {row[0] for row in self.conn.execute(sql, params)}
+
+    def _new_article(self, article_data: Dict[str, Any], created: datetime) -> Article:
+        return Article(
+            id=f"article_{int(created.timestamp())}_{secrets.token_hex(4)}",
+            title=article_data.get('title', ''),
+            source=article_data.get('source', ''),
+            snippet=article_data.get('snippet', ''),
+            date=article_data.get('date', created.date().isoformat()),
+            type=article_data.get('type', 'rss'),
+            url=article_data.get('url'),
+            feed_id=article_data.get('feed_id'),
+            content=article_data.get('content'),
+            author=article_data.get('author'),
+            tags=article_data.get('tags', []),
+            user_id=article_data.get('user_id'),
+            date_ts=article_data.get('date_ts', int(created.timestamp()))
+        )
+
+    def create_article(self, article_data: Dict[str, Any]) -> Optional[Article]:
+        new_article = self._new_article(article_data, datetime.now())
+        self._upsert('articles', [new_article.model_dump()])
+        return new_article
+
+    def create_articles(self, articles_data: List[Dict[str, Any]]) -> List[Article]:
+        """Create many articles in one transaction"""
+        created = datetime.now()
+        new_articles = [self._new_article(article_data, created) for article_data in articles_data]
+        self._upsert('articles', [article.model_dump() for article in new_articles])
+        return new_articles
+
+    def search_articles(self, query: str, user_id: Optional[str] = None) -> List[Article]:
+        return [Article(**row) for row in self._search('articles', query, user_id)]
+
+    # Document operations
+    def get_all_documents(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Document]:
+        return [Document(**row) for row in self._select_for_user('documents', user_id, "upload_date DESC", limit, offset)]
+
+    def create_document(self, document_data: Dict[str, Any]) -> Optional[Document]:
+        created = datetime.now()
+        new_document = Document(
+            id=f"doc_{int(created.timestamp())}_{secrets.token_hex(4)}",
+            name=document_data.get('name', ''),
+            type=document_data.get('type', ''),
+            size=document_data.get('size', 0),
+            upload_date=created.isoformat(),
+            content=document_data.get('content'),
+            status=document_data.get('status', 'ready'),
+            user_id=document_data.get('user_id')
+        )
+        self._upsert('documents', [new_document.model_dump()])
+        return new_document
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        rows = self._select('documents', "id = ?", (document_id,))
+        return Document(**rows[0]) if rows else None
+
+    def delete_document(self, document_id: str) -> bool:
+        return self._delete('documents', document_id)
+
+    def search_documents(self, query: str, user_id: Optional[str] = None) -> List[Document]:
+        return [Document(**row) for row in self._search('documents', query, user_id)]
+
+# Global local store instance; seeded once from the former JSON fallback files
+sqlite_store = SQLiteStore(seed_files={
+    'journals': 'journals.json',
+    'articles': 'articles.json',
+    'documents': 'documents.json'
+})
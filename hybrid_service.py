@@ -1,33 +1,112 @@
-import json
+import logging
 import os
+import secrets
+import threading
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from database_service import db_service, JournalEntry, FeedSubscription, Article, Document
+import orjson
+from database_service import db_service, JournalEntry, FeedSubscription, Article, Document, FEED_UPDATE_FIELDS
+from db import sqlite_store
+
+log = logging.getLogger(__name__)
+
+def read_json_rows(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON array file with a single read() call"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def write_json_rows(path: str, rows: List[Dict[str, Any]]):
+    """
+    Serialize in memory, write a sibling temp file with a single write() call,
+    fsync it and atomically swap it in, so a crash never leaves a half-written store
+    """
+    payload = orjson.dumps(rows, option=orjson.OPT_INDENT_2)
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def search_haystack(*fields: Optional[str]) -> str:
+    """
+    Join a record's searchable fields and lowercase them in one go, so a
+    query is matched with a single substring scan instead of one per field.
+    The NUL separator keeps a match from spanning two fields.
+    """
+    return "\0".join(field for field in fields if field).lower()
+
+# Rows whose search text is kept; least recently searched rows are dropped past this
+SEARCH_TEXT_CACHE_SIZE = 5000
+
+class SearchTextCache:
+    """
+    Bounded LRU of lowercased search text per row id. Each entry can carry a group
+    (the article's feed) so everything belonging to a deleted feed can be dropped at once.
+    """
+    
+    def __init__(self, maxsize: int = SEARCH_TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, build, group: Optional[str] = None) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+        text = build()
+        with self._lock:
+            self._entries[key] = (group, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return text
+    
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def discard_group(self, group: str):
+        with self._lock:
+            for key in [k for k, (g, _) in self._entries.items() if g == group]:
+                del self._entries[key]
 
 class HybridService:
     """
-    Hybrid service that tries Supabase first, falls back to JSON files
+    Hybrid service that tries Supabase first, falls back to local storage
+    (SQLite + FTS5 for journals, articles and documents; JSON for feed subscriptions)
     """
     
     def __init__(self):
         self.db_service = db_service
+        self.local_store = sqlite_store
         self.use_database = True
         self.json_files = {
-            'journals': 'journals.json',
-            'feeds': 'feed_subscriptions.json', 
-            'articles': 'articles.json',
-            'documents': 'documents.json'
+            'feeds': 'feed_subscriptions.json'
         }
+        # Parsed feed file kept in memory, indexed by id; only mutations touch the disk
+        self._feeds_by_id: Optional[Dict[str, FeedSubscription]] = None
+        self._feeds_lock = threading.Lock()
+        # Lowercased search text per article/document id, built once instead of per search
+        self._article_search_text = SearchTextCache()
+        self._document_search_text = SearchTextCache()
     
     def _try_database_operation(self, operation, fallback_operation):
-        """Try database operation, fallback to JSON if it fails"""
+        """Try database operation, fallback to local storage if it fails"""
         if not self.use_database:
             return fallback_operation()
         
         try:
             return operation()
         except Exception as e:
-            print(f"Database operation failed, falling back to JSON: {e}")
+            log.warning("Database operation failed, falling back to local storage: %s", e)
             self.use_database = False
             return fallback_operation()
     
@@ -36,137 +115,74 @@ class HybridService:
         def db_operation():
             return self.db_service.get_all_journals(user_id)
         
-        def json_operation():
-            return self._load_journals_from_json()
+        def local_operation():
+            return self.local_store.get_all_journals(user_id)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
+    
+    def get_all_journals_raw(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Plain journal rows for read-only listings, no Pydantic round-trip"""
+        def db_operation():
+            return self.db_service.get_all_journals_raw(user_id, limit, offset)
+        
+        def local_operation():
+            return self.local_store.get_all_journals_raw(user_id, limit, offset)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
     def get_journal(self, journal_id: str) -> Optional[JournalEntry]:
         def db_operation():
             return self.db_service.get_journal(journal_id)
         
-        def json_operation():
-            journals = self._load_journals_from_json()
-            return next((j for j in journals if j.id == journal_id), None)
+        def local_operation():
+            return self.local_store.get_journal(journal_id)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
     def create_journal(self, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
         def db_operation():
             return self.db_service.create_journal(journal_data)
         
-        def json_operation():
-            return self._create_journal_json(journal_data)
+        def local_operation():
+            return self.local_store.create_journal(journal_data)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
     def update_journal(self, journal_id: str, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
         def db_operation():
             return self.db_service.update_journal(journal_id, journal_data)
         
-        def json_operation():
-            return self._update_journal_json(journal_id, journal_data)
+        def local_operation():
+            return self.local_store.update_journal(journal_id, journal_data)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
+    
+    def update_journal_keywords(self, journal_id: str, keywords: Dict[str, float]) -> bool:
+        def db_operation():
+            return self.db_service.update_journal_keywords(journal_id, keywords)
+        
+        def local_operation():
+            return self.local_store.update_journal_keywords(journal_id, keywords)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
     def delete_journal(self, journal_id: str) -> bool:
         def db_operation():
             return self.db_service.delete_journal(journal_id)
         
-        def json_operation():
-            return self._delete_journal_json(journal_id)
+        def local_operation():
+            return self.local_store.delete_journal(journal_id)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
     def search_journals(self, query: str, user_id: Optional[str] = None) -> List[JournalEntry]:
         def db_operation():
             return self.db_service.search_journals(query, user_id)
         
-        def json_operation():
-            return self._search_journals_json(query)
+        def local_operation():
+            return self.local_store.search_journals(query, user_id)
         
-        return self._try_database_operation(db_operation, json_operation)
-    
-    # JSON fallback methods
-    def _load_journals_from_json(self) -> List[JournalEntry]:
-        """Load journals from JSON file (fallback)"""
-        if os.path.exists(self.json_files['journals']):
-            try:
-                with open(self.json_files['journals'], 'r') as f:
-                    data = json.load(f)
-                    return [JournalEntry(**entry) for entry in data]
-            except Exception:
-                return []
-        return []
-    
-    def _save_journals_to_json(self, journals: List[JournalEntry]):
-        """Save journals to JSON file (fallback)"""
-        with open(self.json_files['journals'], 'w') as f:
-            json.dump([journal.dict() for journal in journals], f, indent=2)
-    
-    def _create_journal_json(self, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
-        """Create journal using JSON storage (fallback)"""
-        journals = self._load_journals_from_json()
-        
-        journal_id = f"j_{int(datetime.now().timestamp())}_{hash(str(datetime.now())) % 1000000:06d}"
-        now = datetime.now().isoformat()
-        
-        new_journal = JournalEntry(
-            id=journal_id,
-            title=journal_data.get('title', ''),
-            content=journal_data.get('content', ''),
-            created_at=now,
-            updated_at=now,
-            word_count=len(journal_data.get('content', '').split()),
-            keywords=journal_data.get('keywords', {}),
-            user_id=journal_data.get('user_id')
-        )
-        
-        journals.append(new_journal)
-        self._save_journals_to_json(journals)
-        return new_journal
-    
-    def _update_journal_json(self, journal_id: str, journal_data: Dict[str, Any]) -> Optional[JournalEntry]:
-        """Update journal using JSON storage (fallback)"""
-        journals = self._load_journals_from_json()
-        journal = next((j for j in journals if j.id == journal_id), None)
-        
-        if not journal:
-            return None
-        
-        # Update fields
-        if 'title' in journal_data:
-            journal.title = journal_data['title']
-        if 'content' in journal_data:
-            journal.content = journal_data['content']
-        
-        journal.updated_at = datetime.now().isoformat()
-        journal.word_count = len(journal.content.split())
-        journal.keywords = journal_data.get('keywords', journal.keywords)
-        
-        self._save_journals_to_json(journals)
-        return journal
-    
-    def _delete_journal_json(self, journal_id: str) -> bool:
-        """Delete journal using JSON storage (fallback)"""
-        journals = self._load_journals_from_json()
-        journals = [j for j in journals if j.id != journal_id]
-        self._save_journals_to_json(journals)
-        return True
-    
-    def _search_journals_json(self, query: str) -> List[JournalEntry]:
-        """Search journals using JSON storage (fallback)"""
-        journals = self._load_journals_from_json()
-        query_lower = query.lower()
-        
-        matching_journals = []
-        for journal in journals:
-            if (query_lower in journal.title.lower() or 
-                query_lower in journal.content.lower() or
-                any(query_lower in keyword.lower() for keyword in journal.keywords.keys())):
-                matching_journals.append(journal)
-        
-        return matching_journals
+        return self._try_database_operation(db_operation, local_operation)
     
     # Feed operations (similar pattern)
     def get_all_feed_subscriptions(self, user_id: Optional[str] = None) -> List[FeedSubscription]:
@@ -174,7 +190,7 @@ class HybridService:
             return self.db_service.get_all_feed_subscriptions(user_id)
         
         def json_operation():
-            return self._load_feeds_from_json()
+            return self.load_local_feeds()
         
         return self._try_database_operation(db_operation, json_operation)
     
@@ -187,8 +203,29 @@ class HybridService:
         
         return self._try_database_operation(db_operation, json_operation)
     
+    def get_feed_subscription(self, subscription_id: str) -> Optional[FeedSubscription]:
+        def db_operation():
+            return self.db_service.get_feed_subscription(subscription_id)
+        
+        def json_operation():
+            with self._feeds_lock:
+                return self._feeds_index().get(subscription_id)
+        
+        return self._try_database_operation(db_operation, json_operation)
+    
+    def update_feed_subscription(self, subscription_id: str, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
+        def db_operation():
+            return self.db_service.update_feed_subscription(subscription_id, feed_data)
+        
+        def json_operation():
+            return self._update_feed_json(subscription_id, feed_data)
+        
+        return self._try_database_operation(db_operation, json_operation)
+    
     def delete_feed_subscription(self, subscription_id: str) -> bool:
         def db_operation():
+            # The feed's articles go with it (ON DELETE CASCADE)
+            self._article_search_text.discard_group(subscription_id)
             return self.db_service.delete_feed_subscription(subscription_id)
         
         def json_operation():
@@ -197,25 +234,33 @@ class HybridService:
         return self._try_database_operation(db_operation, json_operation)
     
     # JSON fallback methods for feeds
-    def _load_feeds_from_json(self) -> List[FeedSubscription]:
+    def load_local_feeds(self) -> List[FeedSubscription]:
+        """Feed subscriptions from the JSON file, parsed once and then served from memory"""
+        with self._feeds_lock:
+            return list(self._feeds_index().values())
+    
+    def _feeds_index(self) -> Dict[str, FeedSubscription]:
+        # Caller holds self._feeds_lock
+        if self._feeds_by_id is None:
+            self._feeds_by_id = {feed.id: feed for feed in self._read_feeds_file()}
+        return self._feeds_by_id
+    
+    def _persist_feeds(self):
+        # Caller holds self._feeds_lock
+        write_json_rows(self.json_files['feeds'], [feed.model_dump(mode='json') for feed in self._feeds_by_id.values()])
+    
+    def _read_feeds_file(self) -> List[FeedSubscription]:
         if os.path.exists(self.json_files['feeds']):
             try:
-                with open(self.json_files['feeds'], 'r') as f:
-                    data = json.load(f)
-                    return [FeedSubscription(**feed) for feed in data]
+                return [FeedSubscription(**feed) for feed in read_json_rows(self.json_files['feeds'])]
             except Exception:
                 return []
         return []
     
-    def _save_feeds_to_json(self, feeds: List[FeedSubscription]):
-        with open(self.json_files['feeds'], 'w') as f:
-            json.dump([feed.dict() for feed in feeds], f, indent=2)
-    
     def _create_feed_json(self, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
-        feeds = self._load_feeds_from_json()
-        
-        feed_id = f"feed_{int(datetime.now().timestamp())}_{hash(str(datetime.now())) % 1000000:06d}"
-        now = datetime.now().isoformat()
+        created = datetime.now()
+        feed_id = f"feed_{int(created.timestamp())}_{secrets.token_hex(4)}"
+        now = created.isoformat()
         
         new_feed = FeedSubscription(
             id=feed_id,
@@ -224,150 +269,183 @@ class HybridService:
             description=feed_data.get('description', ''),
             last_updated=now,
             is_active=feed_data.get('is_active', True),
-            user_id=feed_data.get('user_id')
+            user_id=feed_data.get('user_id'),
+            etag=feed_data.get('etag'),
+            last_modified=feed_data.get('last_modified')
         )
         
-        feeds.append(new_feed)
-        self._save_feeds_to_json(feeds)
+        with self._feeds_lock:
+            self._feeds_index()[new_feed.id] = new_feed
+            self._persist_feeds()
         return new_feed
     
+    def _update_feed_json(self, subscription_id: str, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
+        with self._feeds_lock:
+            feed = self._feeds_index().get(subscription_id)
+            if not feed:
+                return None
+            for field in FEED_UPDATE_FIELDS:
+                if field in feed_data:
+                    setattr(feed, field, feed_data[field])
+            self._persist_feeds()
+            return feed
+    
     def _delete_feed_json(self, subscription_id: str) -> bool:
-        feeds = self._load_feeds_from_json()
-        feeds = [f for f in feeds if f.id != subscription_id]
-        self._save_feeds_to_json(feeds)
+        with self._feeds_lock:
+            if self._feeds_index().pop(subscription_id, None) is not None:
+                self._persist_feeds()
         return True
     
+    # Search text caches (Supabase path; the local store searches through FTS5)
+    def _article_haystack(self, article: Article) -> str:
+        return self._article_search_text.get(
+            article.id,
+            lambda: search_haystack(article.title, article.snippet, article.content, *(article.tags or [])),
+            group=article.feed_id
+        )
+    
+    def _document_haystack(self, document: Document) -> str:
+        return self._document_search_text.get(document.id, lambda: search_haystack(document.name, document.content))
+    
     # Article operations
-    def get_all_articles(self, user_id: Optional[str] = None) -> List[Article]:
+    def get_all_articles(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                         exclude_feeds: Optional[List[str]] = None) -> List[Article]:
         def db_operation():
-            return self.db_service.get_all_articles(user_id)
+            return self.db_service.get_all_articles(user_id, limit, offset, exclude_feeds)
         
-        def json_operation():
-            return self._load_articles_from_json()
+        def local_operation():
+            return self.local_store.get_all_articles(user_id, limit, offset, exclude_feeds)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
     def create_article(self, article_data: Dict[str, Any]) -> Optional[Article]:
         def db_operation():
-            return self.db_service.create_article(article_data)
+            article = self.db_service.create_article(article_data)
+            if article:
+                self._article_haystack(article)
+            return article
         
-        def json_operation():
-            return self._create_article_json(article_data)
+        def local_operation():
+            return self.local_store.create_article(article_data)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
-    # JSON fallback methods for articles
-    def _load_articles_from_json(self) -> List[Article]:
-        if os.path.exists(self.json_files['articles']):
-            try:
-                with open(self.json_files['articles'], 'r') as f:
-                    data = json.load(f)
-                    return [Article(**article) for article in data]
-            except Exception:
-                return []
-        return []
+    def create_articles(self, articles_data: List[Dict[str, Any]]) -> List[Article]:
+        def db_operation():
+            articles = self.db_service.create_articles(articles_data)
+            for article in articles:
+                self._article_haystack(article)
+            return articles
+        
+        def local_operation():
+            return self.local_store.create_articles(articles_data)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
-    def _create_article_json(self, article_data: Dict[str, Any]) -> Optional[Article]:
-        articles = self._load_articles_from_json()
-        
-        article_id = f"article_{int(datetime.now().timestamp())}_{hash(str(datetime.now())) % 1000000:06d}"
-        
-        new_article = Article(
-            id=article_id,
-            title=article_data.get('title', ''),
-            source=article_data.get('source', ''),
-            snippet=article_data.get('snippet', ''),
-            date=article_data.get('date', datetime.now().isoformat().split('T')[0]),
-            type=article_data.get('type', 'rss'),
-            url=article_data.get('url'),
-            feed_id=article_data.get('feed_id'),
-            content=article_data.get('content'),
-            author=article_data.get('author'),
-            tags=article_data.get('tags', []),
-            user_id=article_data.get('user_id')
-        )
+    def get_article_urls(self, user_id: Optional[str] = None) -> set:
+        def db_operation():
+            return self.db_service.get_article_urls(user_id)
         
-        articles.append(new_article)
-        self._save_articles_to_json(articles)
-        return new_article
+        def local_operation():
+            return self.local_store.get_article_urls(user_id)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
-    def _save_articles_to_json(self, articles: List[Article]):
-        with open(self.json_files['articles'], 'w') as f:
-            json.dump([article.dict() for article in articles], f, indent=2)
+    def search_articles(self, query: str, user_id: Optional[str] = None) -> List[Article]:
+        def db_operation():
+            # Tags live in a text[] column PostgREST can't substring-match, so filter here
+            articles = self.db_service.get_all_articles(user_id)
+            query_lower = query.lower()
+            return [
+                article for article in articles
+                if query_lower in self._article_haystack(article)
+            ]
+        
+        def local_operation():
+            return self.local_store.search_articles(query, user_id)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
     # Document operations
-    def get_all_documents(self, user_id: Optional[str] = None) -> List[Document]:
+    def get_all_documents(self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Document]:
         def db_operation():
-            return self.db_service.get_all_documents(user_id)
+            return self.db_service.get_all_documents(user_id, limit, offset)
         
-        def json_operation():
-            return self._load_documents_from_json()
+        def local_operation():
+            return self.local_store.get_all_documents(user_id, limit, offset)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
     
     def create_document(self, document_data: Dict[str, Any]) -> Optional[Document]:
         def db_operation():
-            return self.db_service.create_document(document_data)
+            document = self.db_service.create_document(document_data)
+            if document:
+                self._document_haystack(document)
+            return document
         
-        def json_operation():
-            return self._create_document_json(document_data)
+        def local_operation():
+            return self.local_store.create_document(document_data)
         
-        return self._try_database_operation(db_operation, json_operation)
+        return self._try_database_operation(db_operation, local_operation)
+    
+    def get_document(self, document_id: str) -> Optional[Document]:
+        def db_operation():
+            return self.db_service.get_document(document_id)
+        
+        def local_operation():
+            return self.local_store.get_document(document_id)
+        
+        return self._try_database_operation(db_operation, local_operation)
     
     def delete_document(self, document_id: str) -> bool:
         def db_operation():
+            self._document_search_text.discard(document_id)
             return self.db_service.delete_document(document_id)
         
-        def json_operation():
-            return self._delete_document_json(document_id)
+        def local_operation():
+            return self.local_store.delete_document(document_id)
         
-        return self._try_database_operation(db_operation, json_operation)
-    
-    # JSON fallback methods for documents
-    def _load_documents_from_json(self) -> List[Document]:
-        if os.path.exists(self.json_files['documents']):
-            try:
-                with open(self.json_files['documents'], 'r') as f:
-                    data = json.load(f)
-                    return [Document(**doc) for doc in data]
-            except Exception:
-                return []
-        return []
+        return self._try_database_operation(db_operation, local_operation)
     
-    def _create_document_json(self, document_data: Dict[str, Any]) -> Optional[Document]:
-        documents = self._load_documents_from_json()
-        
-        doc_id = f"doc_{int(datetime.now().timestamp())}_{hash(str(datetime.now())) % 1000000:06d}"
-        now = datetime.now().isoformat()
-        
-        new_document = Document(
-            id=doc_id,
-            name=document_data.get('name', ''),
-            type=document_data.get('type', ''),
-            size=document_data.get('size', 0),
-            upload_date=now,
-            content=document_data.get('content'),
-            status=document_data.get('status', 'ready'),
-            user_id=document_data.get('user_id')
-        )
+    def search_documents(self, query: str, user_id: Optional[str] = None) -> List[Document]:
+        def db_operation():
+            documents = self.db_service.get_all_documents(user_id)
+            query_lower = query.lower()
+            return [
+                document for document in documents
+                if query_lower in self._document_haystack(document)
+            ]
         
-        documents.append(new_document)
-        self._save_documents_to_json(documents)
-        return new_document
-    
-    def _delete_document_json(self, document_id: str) -> bool:
-        documents = self._load_documents_from_json()
-        documents = [d for d in documents if d.id != document_id]
-        self._save_documents_to_json(documents)
-        return True
-    
-    def _save_documents_to_json(self, documents: List[Document]):
-        with open(self.json_files['documents'], 'w') as f:
-            json.dump([doc.dict() for doc in documents], f, indent=2)
+        def local_operation():
+            return self.local_store.search_documents(query, user_id)
+        
+        return self._try_database_operation(db_operation, local_operation)
 
 # Global hybrid service instance
 hybrid_service = HybridService()
 
+class LocalFeedStore:
+    """The feed-refresh operations of the hybrid service, against the local JSON/SQLite store only"""
+    
+    def __init__(self, hybrid: HybridService):
+        self.hybrid = hybrid
+    
+    def get_all_feed_subscriptions(self, user_id: Optional[str] = None) -> List[FeedSubscription]:
+        feeds = self.hybrid.load_local_feeds()
+        return [feed for feed in feeds if feed.user_id == user_id] if user_id else feeds
+    
+    def get_article_urls(self, user_id: Optional[str] = None) -> set:
+        return self.hybrid.local_store.get_article_urls(user_id)
+    
+    def update_feed_subscription(self, subscription_id: str, feed_data: Dict[str, Any]) -> Optional[FeedSubscription]:
+        return self.hybrid._update_feed_json(subscription_id, feed_data)
+    
+    def create_articles(self, articles_data: List[Dict[str, Any]]) -> List[Article]:
+        return self.hybrid.local_store.create_articles(articles_data)
+
+# Local-only feed store for jobs that must not reach Supabase through the shared client
+local_feed_store = LocalFeedStore(hybrid_service)
+
 
 
 
@@ -0,0 +1,146 @@
+import logging
+import os
+import pickle
+import threading
+from typing import List, Dict, Optional
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from hybrid_service import hybrid_service
+
+log = logging.getLogger(__name__)
+
+VECTORIZER_PATH = os.getenv("READNEST_VECTORIZER_PATH", "tfidf_vectorizer.pkl")
+# Refit the corpus vectorizer after this many new journals/documents
+VECTORIZER_REFIT_EVERY = int(os.getenv("READNEST_VECTORIZER_REFIT_EVERY", "50"))
+# Newest rows per table (journals, articles, documents) the vectorizer is fitted on
+VECTORIZER_MAX_DOCS = int(os.getenv("READNEST_VECTORIZER_MAX_DOCS", "5000"))
+# Vocabulary cap for the corpus vectorizer (terms and bigrams by corpus frequency)
+VECTORIZER_MAX_FEATURES = 50000
+
+def top_terms(features, indices, scores, top_n: int) -> Dict[str, float]:
+    """Top-N terms of one sparse TF-IDF row, highest score first"""
+    if len(scores) > top_n:
+        # Partial selection of the top-N non-zero scores, then order just those
+        top = np.argpartition(scores, -top_n)[-top_n:]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top])]
+    return {str(features[indices[j]]): round(float(scores[j]), 4) for j in top}
+
+class KeywordService:
+    """
+    Corpus-wide TF-IDF keyword extraction for journal entries, run as a batch off the request path
+    """
+
+    def __init__(self, top_n: int = 30, vectorizer_path: str = VECTORIZER_PATH):
+        self.top_n = top_n
+        self.vectorizer_path = vectorizer_path
+        self._pending_users = set()
+        self._lock = threading.Lock()
+        # Vectorizer fitted on journals + articles + documents, used for write-time keywords
+        # (vectorizer, feature names), swapped in as one reference so readers never mix two fits
+        self._model: Optional[tuple] = None
+        self._inserts_since_fit = 0
+        self._fit_lock = threading.Lock()
+
+    def compute_keywords(self, contents: List[str], top_n: Optional[int] = None) -> Optional[List[Dict[str, float]]]:
+        """Top-N terms per document, scored by the corpus vectorizer; None if it isn't fitted yet"""
+        model = self._model
+        if model is None:
+            return None
+        vectorizer, features = model
+        # IDF comes from the whole corpus, so each entry keeps its own distinctive terms
+        matrix = vectorizer.transform(contents).tocsr()
+
+        results = []
+        for i in range(matrix.shape[0]):
+            start, end = matrix.indptr[i], matrix.indptr[i + 1]
+            results.append(top_terms(features, matrix.indices[start:end], matrix.data[start:end], top_n or self.top_n))
+        return results
+
+    # Corpus vectorizer
+    def load_corpus_vectorizer(self) -> bool:
+        """Load the pickled corpus vectorizer; returns False when it still has to be fitted"""
+        if os.path.exists(self.vectorizer_path):
+            try:
+                with open(self.vectorizer_path, 'rb') as f:
+                    self._set_vectorizer(pickle.load(f))
+                return True
+            except Exception as e:
+                log.warning("Could not load %s, refitting: %s", self.vectorizer_path, e)
+        return False
+
+    def fit_corpus_vectorizer(self):
+        """Fit TF-IDF on the newest journals, articles and documents and pickle it to disk"""
+        if not self._fit_lock.acquire(blocking=False):
+            return  # a fit is already running
+        try:
+            corpus = [j.get('content') or "" for j in hybrid_service.get_all_journals_raw(limit=VECTORIZER_MAX_DOCS)]
+            corpus += [f"{a.title} {a.snippet} {a.content or ''}" for a in hybrid_service.get_all_articles(limit=VECTORIZER_MAX_DOCS)]
+            corpus += [d.content or "" for d in hybrid_service.get_all_documents(limit=VECTORIZER_MAX_DOCS)]
+            vectorizer = TfidfVectorizer(
+                max_df=0.5, min_df=2, max_features=VECTORIZER_MAX_FEATURES,
+                stop_words='english', ngram_range=(1, 2)
+            )
+            try:
+                vectorizer.fit(corpus)
+            except ValueError as e:
+                # Empty corpus or nothing left after pruning; keep the frequency fallback
+                log.info("Skipping corpus vectorizer fit: %s", e)
+                return
+            # Every pruned term is kept here for introspection only; dropping it keeps the pickle small
+            vectorizer.stop_words_ = None
+
+            tmp_path = f"{self.vectorizer_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.vectorizer_path)
+            self._set_vectorizer(vectorizer)
+            with self._lock:
+                self._inserts_since_fit = 0
+        finally:
+            self._fit_lock.release()
+
+    def _set_vectorizer(self, vectorizer: TfidfVectorizer):
+        # Features are looked up on every transform, so cache the array once per fit
+        self._model = (vectorizer, vectorizer.get_feature_names_out())
+
+    def note_corpus_insert(self) -> bool:
+        """Count a new corpus document; returns True when the vectorizer is due for a refit"""
+        with self._lock:
+            self._inserts_since_fit += 1
+            return self._inserts_since_fit >= VECTORIZER_REFIT_EVERY
+
+    def extract_keywords(self, text: str, top_n: Optional[int] = None) -> Optional[Dict[str, float]]:
+        """Keywords for one text from the corpus vectorizer, or None if it isn't fitted yet"""
+        keywords = self.compute_keywords([text], top_n)
+        return keywords[0] if keywords is not None else None
+
+    def schedule_refresh(self, user_id: Optional[str]) -> bool:
+        """Mark a user's journals as dirty; returns False if a refresh is already queued"""
+        with self._lock:
+            if user_id in self._pending_users:
+                return False
+            self._pending_users.add(user_id)
+            return True
+
+    def refresh_journal_keywords(self, user_id: Optional[str] = None):
+        """Rescore every journal of a user with the corpus vectorizer and store the ones that changed"""
+        with self._lock:
+            self._pending_users.discard(user_id)
+
+        journals = hybrid_service.get_all_journals(user_id=user_id)
+        if not journals:
+            return
+
+        keywords = self.compute_keywords([j.content or "" for j in journals])
+        if keywords is None:
+            # No corpus vectorizer yet; the write-time keywords stay in place
+            return
+
+        for journal, journal_keywords in zip(journals, keywords):
+            if journal_keywords and journal_keywords != journal.keywords:
+                hybrid_service.update_journal_keywords(journal.id, journal_keywords)
+
+# Global keyword service instance
+keyword_service = KeywordService()
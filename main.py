@@ -114,27 +114,47 @@ async def get_feed(feed_id: str):
     if not feed:
         return JSONResponse({"error":"not found"}, status_code=404)
     return feed
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Depends, Header
+import bootstrap  # noqa: F401 - loads .env before any module reads settings
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Depends, Header, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from scholar_agent import scholar_agent
-from hybrid_service import hybrid_service
+from langchain_groq import ChatGroq
+from hybrid_service import hybrid_service, local_feed_store
+from database_service import DatabaseService
+from keyword_service import keyword_service
+import asyncio
 import json
 import os
+import re
+import orjson
+from collections import Counter, OrderedDict
+from functools import wraps
 from datetime import datetime
-import uuid
+import calendar
+import fcntl
+import secrets
+import threading
+import time
 import feedparser
 import requests
 from bs4 import BeautifulSoup
-import PyPDF2
+import pypdfium2 as pdfium
 import docx
 import io
 import httpx
-import traceback, json
-from supabase_config import supabase
+from lxml import etree
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import logging
+from supabase_config import get_supabase, get_service_supabase, create_user_supabase
 
-app = FastAPI(title="ReadNest Backend", version="1.0.0")
+log = logging.getLogger(__name__)
+
+app = FastAPI(title="ReadNest Backend", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -145,6 +165,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Sent Events endpoints; GZipMiddleware would buffer their chunks
+STREAMING_PATHS = {"/api/chat/stream"}
+
+class GZipExceptStreams:
+    """GZipMiddleware for every route except the streaming ones, which pass through untouched"""
+    
+    def __init__(self, app, streaming_paths=STREAMING_PATHS, **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.streaming_paths = streaming_paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.streaming_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+# Compress large JSON list/search payloads; small bodies are sent as-is
+app.add_middleware(GZipExceptStreams, minimum_size=1024, compresslevel=5)
+
+# Shared, connection-pooled HTTP client for outbound fetches (closed on shutdown).
+# HTTP/2 multiplexes concurrent searches to the same API host over one connection.
+http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    follow_redirects=True
+)
+
 # Pydantic models
 class JournalEntry(BaseModel):
     id: str
@@ -180,66 +229,62 @@ def get_current_user(authorization: Optional[str] = Header(None)):
     try:
         # Ensure subsequent PostgREST calls run under this user's RLS context
         try:
-            supabase.postgrest.auth(token)
+            get_supabase().postgrest.auth(token)
         except Exception:
             pass
-        user_resp = supabase.auth.get_user(token)
+        user_resp = get_supabase().auth.get_user(token)
         user = user_resp.user
         if not user:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.id, "email": user.email}
+        # The token travels with the user so background work can act under the same RLS context
+        return {"id": user.id, "email": user.email, "token": token}
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-# Using hybrid service (Supabase + JSON fallback)
-
-def extract_keywords(text: str, top_n: int = 30) -> dict:
-    """Extract meaningful keywords from text, filtering out common stop words"""
+# Using hybrid service (Supabase + local SQLite/JSON fallback)
+
+# Common stop words to filter out of journal keywords
+KEYWORD_STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'been', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to',
+    'was', 'were', 'will', 'with', 'this', 'but', 'they', 'have',
+    'had', 'what', 'said', 'each', 'which', 'their', 'time', 'about',
+    'if', 'up', 'out', 'many', 'then', 'them', 'these', 'so', 'some', 'her',
+    'would', 'make', 'like', 'into', 'him', 'two', 'more', 'write',
+    'go', 'see', 'number', 'no', 'way', 'could', 'people', 'my', 'than',
+    'first', 'call', 'who', 'oil', 'sit', 'now', 'find', 'down',
+    'day', 'did', 'get', 'come', 'made', 'may', 'part', 'new', 'save',
+    'entry', 'entries', 'note', 'notes', 'journal', 'journals', 'read',
+    'reading', 'text', 'content', 'title', 'keyword', 'keywords'
+})
+
+# Compiled once at import instead of on every call; matches the word runs left after stripping punctuation
+KEYWORD_WORD_RE = re.compile(r'\w+')
+
+def analyze_content(text: str, top_n: int = 30) -> tuple[int, dict]:
+    """Word count and keywords for a journal body from a single split of the text"""
     if not text:
-        return {}
+        return 0, {}
     
-    import re
-    
-    # Common stop words to filter out
-    stop_words = {
-        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'been', 'by', 'for', 'from',
-        'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to',
-        'was', 'were', 'will', 'with', 'the', 'this', 'but', 'they', 'have',
-        'had', 'what', 'said', 'each', 'which', 'their', 'time', 'will', 'about',
-        'if', 'up', 'out', 'many', 'then', 'them', 'these', 'so', 'some', 'her',
-        'would', 'make', 'like', 'into', 'him', 'has', 'two', 'more', 'write',
-        'go', 'see', 'number', 'no', 'way', 'could', 'people', 'my', 'than',
-        'first', 'been', 'call', 'who', 'oil', 'sit', 'now', 'find', 'down',
-        'day', 'did', 'get', 'come', 'made', 'may', 'part', 'new', 'save',
-        'entry', 'entries', 'note', 'notes', 'journal', 'journals', 'read',
-        'reading', 'text', 'content', 'title', 'keyword', 'keywords'
-    }
+    words = text.lower().split()
+    word_count = len(words)
     
-    # Tokenize and clean text
-    tokens = re.sub(r'[^\w\s]', ' ', text.lower()).split()
+    # Prefer the corpus TF-IDF vectorizer; fall back to raw term frequency until it is fitted
+    keywords = keyword_service.extract_keywords(text, top_n)
+    if keywords:
+        return word_count, keywords
     
-    # Filter: keep only words that are:
-    # - Longer than 3 characters (more meaningful)
-    # - Not in stop words list
-    # - Not pure numbers
-    tokens = [
-        t for t in tokens 
-        if len(t) > 3 
-        and t not in stop_words 
+    # Plain words are used as-is; only words carrying punctuation go through the regex
+    tokens = (
+        t for w in words for t in ((w,) if w.isalnum() else KEYWORD_WORD_RE.findall(w))
+        # Keep only words that are longer than 3 characters, not stop words and not pure numbers
+        if len(t) > 3
+        and t not in KEYWORD_STOP_WORDS
         and not t.isdigit()
-    ]
-    
-    if not tokens:
-        return {}
-    
-    # Count frequency
-    freq = {}
-    for token in tokens:
-        freq[token] = freq.get(token, 0) + 1
+    )
     
-    # Return top N keywords sorted by frequency
-    sorted_keywords = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    return dict(sorted_keywords)
+    # Counter counts in C; most_common(n) is a heap selection rather than a full sort
+    return word_count, dict(Counter(tokens).most_common(top_n))
 
 @app.get("/")
 def read_root():
@@ -247,9 +292,10 @@ def read_root():
 
 # Journal API endpoints
 @app.get("/api/journals", response_model=List[JournalEntry])
-def get_all_journals(current_user: dict = Depends(get_current_user)):
-    """Get all journal entries"""
-    return hybrid_service.get_all_journals(user_id=current_user["id"])
+def get_all_journals(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
+    """Get journal entries, newest first, one page at a time"""
+    # Read-only listing: rows go straight to orjson, response_model only documents the shape
+    return ORJSONResponse(hybrid_service.get_all_journals_raw(user_id=current_user["id"], limit=limit, offset=offset))
 
 @app.get("/api/journals/{journal_id}", response_model=JournalEntry)
 def get_journal(journal_id: str, current_user: dict = Depends(get_current_user)):
@@ -257,17 +303,16 @@ def get_journal(journal_id: str, current_user: dict = Depends(get_current_user))
     journal = hybrid_service.get_journal(journal_id)
     if not journal:
         raise HTTPException(status_code=404, detail="Journal not found")
-    # RLS prevents cross-user reads from DB; add explicit check for JSON fallback
+    # RLS prevents cross-user reads from DB; add explicit check for the local fallback
     if getattr(journal, "user_id", None) and journal.user_id != current_user["id"]:
         raise HTTPException(status_code=404, detail="Journal not found")
     return journal
 
 @app.post("/api/journals", response_model=JournalEntry)
-def create_journal(journal_data: JournalCreate, current_user: dict = Depends(get_current_user)):
+def create_journal(journal_data: JournalCreate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     """Create a new journal entry"""
     # Calculate word count and extract keywords
-    word_count = len(journal_data.content.split()) if journal_data.content else 0
-    keywords = extract_keywords(journal_data.content)
+    word_count, keywords = analyze_content(journal_data.content)
     
     journal_dict = {
         'title': journal_data.title,
@@ -281,10 +326,16 @@ def create_journal(journal_data: JournalCreate, current_user: dict = Depends(get
     if not new_journal:
         raise HTTPException(status_code=500, detail="Failed to create journal")
     
+    # Frequency keywords are provisional; the corpus-wide TF-IDF pass replaces them
+    if keyword_service.schedule_refresh(current_user["id"]):
+        background_tasks.add_task(keyword_service.refresh_journal_keywords, current_user["id"])
+    if keyword_service.note_corpus_insert():
+        background_tasks.add_task(keyword_service.fit_corpus_vectorizer)
+    
     return new_journal
 
 @app.put("/api/journals/{journal_id}", response_model=JournalEntry)
-def update_journal(journal_id: str, journal_data: JournalUpdate, current_user: dict = Depends(get_current_user)):
+def update_journal(journal_id: str, journal_data: JournalUpdate, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     """Update an existing journal entry"""
     update_dict = {}
     
@@ -293,8 +344,7 @@ def update_journal(journal_id: str, journal_data: JournalUpdate, current_user: d
         update_dict['title'] = journal_data.title
     if journal_data.content is not None:
         update_dict['content'] = journal_data.content
-        update_dict['word_count'] = len(journal_data.content.split())
-        update_dict['keywords'] = extract_keywords(journal_data.content)
+        update_dict['word_count'], update_dict['keywords'] = analyze_content(journal_data.content)
     
     updated_journal = hybrid_service.update_journal(journal_id, update_dict)
     if not updated_journal:
@@ -302,6 +352,9 @@ def update_journal(journal_id: str, journal_data: JournalUpdate, current_user: d
     if getattr(updated_journal, "user_id", None) and updated_journal.user_id != current_user["id"]:
         raise HTTPException(status_code=403, detail="Forbidden")
     
+    if journal_data.content is not None and keyword_service.schedule_refresh(current_user["id"]):
+        background_tasks.add_task(keyword_service.refresh_journal_keywords, current_user["id"])
+    
     return updated_journal
 
 @app.delete("/api/journals/{journal_id}")
@@ -314,9 +367,9 @@ def delete_journal(journal_id: str, current_user: dict = Depends(get_current_use
     return {"message": "Journal deleted successfully"}
 
 @app.get("/api/journals/search/{query}")
-def search_journals(query: str, current_user: dict = Depends(get_current_user)):
+def search_journals(query: str, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
     """Search journals by title or content"""
-    return hybrid_service.search_journals(query, user_id=current_user["id"])
+    return hybrid_service.search_journals(query, user_id=current_user["id"])[offset:offset + limit]
 
 # RSS Feed System
 
@@ -328,6 +381,9 @@ class FeedSubscription(BaseModel):
     last_updated: str
     is_active: bool = True
     user_id: Optional[str] = None
+    # HTTP validators from the last fetch, sent back as a conditional GET
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 class Article(BaseModel):
     id: str
@@ -342,6 +398,7 @@ class Article(BaseModel):
     author: Optional[str] = None
     tags: Optional[List[str]] = []
     user_id: Optional[str] = None
+    date_ts: int = 0  # unix seconds, numeric sort key for `date`
 
 class FeedCreate(BaseModel):
     url: str
@@ -357,67 +414,25 @@ class Document(BaseModel):
     status: str = "ready"  # 'uploading', 'processing', 'ready', 'error'
     user_id: Optional[str] = None
 
-# Storage files
-FEEDS_FILE = "feed_subscriptions.json"
-ARTICLES_FILE = "articles.json"
-DOCUMENTS_FILE = "documents.json"
-
-def load_feed_subscriptions() -> List[FeedSubscription]:
-    """Load feed subscriptions from local JSON file"""
-    if os.path.exists(FEEDS_FILE):
-        try:
-            with open(FEEDS_FILE, 'r') as f:
-                data = json.load(f)
-                return [FeedSubscription(**feed) for feed in data]
-        except Exception:
-            return []
-    return []
-
-def save_feed_subscriptions(subscriptions: List[FeedSubscription]):
-    """Save feed subscriptions to local JSON file"""
-    with open(FEEDS_FILE, 'w') as f:
-        json.dump([sub.dict() for sub in subscriptions], f, indent=2)
-
-def load_articles() -> List[Article]:
-    """Load articles from local JSON file"""
-    if os.path.exists(ARTICLES_FILE):
-        try:
-            with open(ARTICLES_FILE, 'r') as f:
-                data = json.load(f)
-                return [Article(**article) for article in data]
-        except Exception:
-            return []
-    return []
-
-def save_articles(articles: List[Article]):
-    """Save articles to local JSON file"""
-    with open(ARTICLES_FILE, 'w') as f:
-        json.dump([article.dict() for article in articles], f, indent=2)
-
-def load_documents() -> List[Document]:
-    """Load documents from local JSON file"""
-    if os.path.exists(DOCUMENTS_FILE):
-        try:
-            with open(DOCUMENTS_FILE, 'r') as f:
-                data = json.load(f)
-                return [Document(**doc) for doc in data]
-        except Exception:
-            return []
-    return []
-
-def save_documents(documents: List[Document]):
-    """Save documents to local JSON file"""
-    with open(DOCUMENTS_FILE, 'w') as f:
-        json.dump([doc.dict() for doc in documents], f, indent=2)
+# PDFium is not thread-safe and extraction runs in the threadpool, so only one
+# thread may use pypdfium2 at a time
+PDFIUM_LOCK = threading.Lock()
 
 def extract_text_from_pdf(file_content: bytes) -> str:
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_content)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                return "\n".join(pages).strip()
+            finally:
+                pdf.close()
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
@@ -425,20 +440,14 @@ def extract_text_from_docx(file_content: bytes) -> str:
     """Extract text from DOCX file"""
     try:
         doc = docx.Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
     except Exception as e:
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
 
-def process_document(file: UploadFile) -> Document:
-    """Process uploaded document and extract text"""
-    # Read file content
-    file_content = file.file.read()
-    
+def process_document(file_content: bytes, filename: str, content_type: str) -> Document:
+    """Process uploaded document bytes and extract text"""
     # Determine file type
-    file_type = "pdf" if file.content_type == "application/pdf" else "doc"
+    file_type = "pdf" if content_type == "application/pdf" else "doc"
     
     # Extract text based on file type
     try:
@@ -450,23 +459,25 @@ def process_document(file: UploadFile) -> Document:
         raise Exception(f"Failed to process document: {str(e)}")
     
     # Create document object
+    now = datetime.now()
     document = Document(
-        id=f"doc_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}",
-        name=file.filename,
+        id=f"doc_{int(now.timestamp())}_{secrets.token_hex(4)}",
+        name=filename,
         type=file_type,
         size=len(file_content),
-        upload_date=datetime.now().isoformat(),
+        upload_date=now.isoformat(),
         content=content,
         status="ready"
     )
     
     return document
 
-def parse_rss_feed(feed_url: str, custom_name: str = None) -> tuple[FeedSubscription, List[Article]]:
+def parse_rss_feed(feed_url: str, custom_name: str = None, feed_body: bytes = None, feed_headers: Optional[dict] = None) -> tuple[FeedSubscription, List[Article]]:
     """Parse RSS feed and return subscription info and articles"""
     try:
-        # Parse the RSS feed
-        feed = feedparser.parse(feed_url)
+        # Parse an already-fetched body when given, otherwise let feedparser fetch the URL.
+        # The body's HTTP headers carry the charset some feeds only declare in Content-Type.
+        feed = feedparser.parse(feed_body if feed_body is not None else feed_url, response_headers=feed_headers)
         
         if feed.bozo:
             raise Exception(f"Invalid RSS feed: {feed.bozo_exception}")
@@ -474,65 +485,82 @@ def parse_rss_feed(feed_url: str, custom_name: str = None) -> tuple[FeedSubscrip
         if not feed.entries:
             raise Exception("No entries found in RSS feed")
         
+        # Timestamps are taken once and shared by the subscription and every article
+        now = datetime.now()
+        now_ts = int(now.timestamp())
+        now_iso = now.isoformat()
+        today = now_iso.split('T')[0]
+        
         # Create feed subscription
         subscription = FeedSubscription(
-            id=f"feed_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}",
+            id=f"feed_{now_ts}_{secrets.token_hex(4)}",
             url=feed_url,
             title=custom_name or feed.feed.get('title', 'Untitled Feed'),
             description=feed.feed.get('description', 'No description'),
-            last_updated=datetime.now().isoformat(),
+            last_updated=now_iso,
             is_active=True
         )
         
-        # Parse articles
+        # Parse articles (FeedParserDict lookups go through .get, not attribute access)
         articles = []
+        source = subscription.title
+        feed_id = subscription.id
         for entry in feed.entries[:50]:  # Limit to 50 most recent articles
             # Extract content
             content = ""
-            if hasattr(entry, 'content') and entry.content:
-                content = entry.content[0].value if entry.content else ""
-            elif hasattr(entry, 'summary'):
-                content = entry.summary
+            entry_content = entry.get('content')
+            summary = entry.get('summary')
+            if entry_content:
+                content = entry_content[0].get('value', '')
+            elif summary is not None:
+                content = summary
             
-            # Clean HTML content
+            # Clean HTML content (plain text without markup or entities skips the parser entirely)
             if content:
-                soup = BeautifulSoup(content, 'html.parser')
-                content = soup.get_text()[:1000]  # Limit to 1000 chars
+                if '<' in content or '&' in content:
+                    # Cap the raw HTML first so huge payloads don't dominate parse time
+                    soup = BeautifulSoup(content[:8192], 'lxml')
+                    content = soup.get_text(" ", strip=True)[:1000]  # Limit to 1000 chars
+                else:
+                    content = content.strip()[:1000]
             
             # Extract snippet
             snippet = content[:200] + "..." if len(content) > 200 else content
-            if not snippet and hasattr(entry, 'summary'):
-                snippet = entry.summary[:200] + "..." if len(entry.summary) > 200 else entry.summary
+            if not snippet and summary:
+                snippet = summary[:200] + "..." if len(summary) > 200 else summary
             
             # Parse date
-            article_date = datetime.now().isoformat().split('T')[0]  # Default to today
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            article_date = today  # Default to today
+            article_ts = now_ts
+            published = entry.get('published_parsed')
+            if published:
                 try:
-                    article_date = datetime(*entry.published_parsed[:6]).isoformat().split('T')[0]
+                    article_date = datetime(*published[:6]).isoformat().split('T')[0]
+                    article_ts = calendar.timegm(published)  # feedparser normalises to UTC
                 except:
                     pass
             
             # Extract tags properly
             tags = []
-            if hasattr(entry, 'tags') and entry.tags:
-                for tag in entry.tags[:5]:  # Limit to 5 tags
-                    if hasattr(tag, 'term') and tag.term:
-                        tags.append(tag.term)
-                    elif isinstance(tag, str):
-                        tags.append(tag)
+            for tag in (entry.get('tags') or [])[:5]:  # Limit to 5 tags
+                if isinstance(tag, str):
+                    tags.append(tag)
+                elif tag.get('term'):
+                    tags.append(tag['term'])
             
             article = Article(
-                id=f"article_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}",
+                id=f"article_{now_ts}_{secrets.token_hex(4)}",
                 title=entry.get('title', 'Untitled Article'),
-                source=subscription.title,
+                source=source,
                 snippet=snippet,
                 date=article_date,
                 type="rss",
                 url=entry.get('link', ''),
-                feed_id=subscription.id,
+                feed_id=feed_id,
                 content=content,
                 author=entry.get('author', ''),
-                tags=tags
+                tags=tags,
+                date_ts=article_ts
             )
             articles.append(article)
         
@@ -541,43 +569,136 @@ def parse_rss_feed(feed_url: str, custom_name: str = None) -> tuple[FeedSubscrip
     except Exception as e:
         raise Exception(f"Failed to parse RSS feed: {str(e)}")
 
-def refresh_all_feeds():
-    """Refresh all active feed subscriptions"""
-    subscriptions = load_feed_subscriptions()
-    all_articles = load_articles()
-    
-    for subscription in subscriptions:
-        if not subscription.is_active:
-            continue
-            
-        try:
-            _, new_articles = parse_rss_feed(subscription.url)
-            
-            # Update subscription
-            subscription.last_updated = datetime.now().isoformat()
-            
-            # Add new articles (avoid duplicates)
-            existing_urls = {article.url for article in all_articles if article.url}
-            for article in new_articles:
-                if article.url not in existing_urls:
-                    all_articles.append(article)
-            
-        except Exception as e:
-            print(f"Failed to refresh feed {subscription.title}: {e}")
-    
-    # Save updated data
-    save_feed_subscriptions(subscriptions)
-    save_articles(all_articles)
-    
-    return all_articles
+async def fetch_rss_feed(feed_url: str, custom_name: str = None, etag: str = None, last_modified: str = None) -> Optional[tuple[FeedSubscription, List[Article]]]:
+    """
+    Fetch a feed over the shared client and parse it off the event loop.
+    Returns None when the server answers 304 to the conditional GET.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = await http_client.get(feed_url, headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    subscription, articles = await run_in_threadpool(parse_rss_feed, feed_url, custom_name, response.content, dict(response.headers))
+    subscription.etag = response.headers.get("etag")
+    subscription.last_modified = response.headers.get("last-modified")
+    return subscription, articles
+
+async def fetch_rss_feeds(subscriptions: List[FeedSubscription]) -> list:
+    """Fetch and parse feeds concurrently; failed feeds come back as exceptions, unchanged ones as None"""
+    return await asyncio.gather(
+        *(fetch_rss_feed(s.url, s.title, s.etag, s.last_modified) for s in subscriptions),
+        return_exceptions=True
+    )
+
+async def refresh_all_feeds() -> int:
+    """
+    Scheduled refresh of every user's active feeds. The shared anon client runs under the last
+    request's JWT, so Supabase feeds are only refreshed with SUPABASE_SERVICE_ROLE_KEY set;
+    without it the job refreshes the local store only.
+    """
+    service_client = get_service_supabase() if hybrid_service.use_database else None
+    store = DatabaseService(service_client) if service_client else local_feed_store
+    subscriptions = await run_in_threadpool(store.get_all_feed_subscriptions)
+    user_ids = {s.user_id for s in subscriptions if s.is_active and s.user_id}
+
+    # Each user's refresh stores its own articles and validators, so a failure stays contained
+    results = await asyncio.gather(*(refresh_user_feeds(u, store) for u in user_ids), return_exceptions=True)
+    added = 0
+    for user_id, result in zip(user_ids, results):
+        if isinstance(result, Exception):
+            log.warning("Failed to refresh feeds for user %s: %s", user_id, result)
+        else:
+            added += result
+    return added
+
+# Periodic refresh so feeds stay fresh without user action
+FEED_REFRESH_MINUTES = int(os.getenv("FEED_REFRESH_MINUTES", "15"))
+feed_scheduler = AsyncIOScheduler()
+
+@app.on_event("startup")
+async def prime_local_caches():
+    # Parse the local feed store once up front instead of on the first request
+    await run_in_threadpool(hybrid_service.load_local_feeds)
+
+@app.on_event("startup")
+async def load_keyword_vectorizer():
+    # Load the pickled corpus TF-IDF vectorizer once, not on the request path. A first fit
+    # runs in the background; analyze_content uses frequency keywords until it lands.
+    if not await run_in_threadpool(keyword_service.load_corpus_vectorizer):
+        app.state.vectorizer_fit = asyncio.create_task(run_in_threadpool(keyword_service.fit_corpus_vectorizer))
+
+# Opt-in: run one throwaway scholar_agent call at startup so the Groq client and graph are
+# warm before the first user request. Each boot, reload and worker makes a billed LLM call.
+SCHOLAR_WARMUP = os.getenv("SCHOLAR_WARMUP", "0") == "1"
+scholar_agent_warm = False
+
+async def warmup_scholar_agent():
+    global scholar_agent_warm
+    if scholar_agent_warm:
+        return
+    scholar_agent_warm = True
+    try:
+        await scholar_agent.ainvoke({"user_prompt": "warmup", "papers": []})
+    except Exception as e:
+        log.warning("scholar_agent warmup failed: %s", e)
+
+@app.on_event("startup")
+async def start_scholar_warmup():
+    # In the background, so a slow LLM doesn't hold up startup
+    if SCHOLAR_WARMUP and os.getenv("GROQ_API_KEY"):
+        # Keep a reference so the task isn't garbage-collected mid-flight
+        app.state.scholar_warmup = asyncio.create_task(warmup_scholar_agent())
+
+# Only the worker process holding this file lock runs the scheduler
+SCHEDULER_LOCK_PATH = os.getenv("READNEST_SCHEDULER_LOCK", "feed_scheduler.lock")
+
+def acquire_scheduler_lock() -> bool:
+    """Take a non-blocking exclusive lock; the file stays open (and locked) for the life of the process"""
+    lock_file = open(SCHEDULER_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    app.state.scheduler_lock = lock_file
+    return True
+
+@app.on_event("startup")
+async def start_feed_scheduler():
+    if not acquire_scheduler_lock():
+        log.info("Feed scheduler runs in another worker")
+        return
+    # Coroutine jobs run on the app's event loop and share its HTTP client
+    feed_scheduler.add_job(
+        refresh_all_feeds, "interval", minutes=FEED_REFRESH_MINUTES,
+        id="refresh_all_feeds", max_instances=1, coalesce=True, replace_existing=True
+    )
+    feed_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_feed_scheduler():
+    if feed_scheduler.running:
+        feed_scheduler.shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
 
 # Feed API endpoints
 @app.get("/api/feeds", response_model=List[Article])
-def get_all_articles(current_user: dict = Depends(get_current_user)):
-    """Get all articles for the current user from active feeds"""
-    articles = hybrid_service.get_all_articles(user_id=current_user["id"])
-    articles.sort(key=lambda x: x.date, reverse=True)
-    return articles
+def get_all_articles(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
+    """Get articles for the current user from active feeds, newest first, one page at a time"""
+    subscriptions = hybrid_service.get_all_feed_subscriptions(user_id=current_user["id"])
+    inactive_feeds = [s.id for s in subscriptions if not s.is_active]
+    # The inactive-feed filter, date_ts ordering and page all run in the store query
+    return hybrid_service.get_all_articles(
+        user_id=current_user["id"], limit=limit, offset=offset, exclude_feeds=inactive_feeds
+    )
 
 @app.get("/api/feeds/subscriptions", response_model=List[FeedSubscription])
 def get_feed_subscriptions(current_user: dict = Depends(get_current_user)):
@@ -585,19 +706,22 @@ def get_feed_subscriptions(current_user: dict = Depends(get_current_user)):
     return hybrid_service.get_all_feed_subscriptions(user_id=current_user["id"])
 
 @app.post("/api/feeds", response_model=dict)
-def add_feed_subscription(feed_data: FeedCreate, current_user: dict = Depends(get_current_user)):
+async def add_feed_subscription(feed_data: FeedCreate, current_user: dict = Depends(get_current_user)):
     """Add a new RSS feed subscription"""
     try:
-        # Parse the RSS feed
-        subscription, articles = parse_rss_feed(feed_data.url, feed_data.name)
+        # Fetch and parse the RSS feed
+        subscription, articles = await fetch_rss_feed(feed_data.url, feed_data.name)
         
         # Associate with user and persist via database-first hybrid service
         subscription.user_id = current_user["id"]
+        created_sub = await run_in_threadpool(hybrid_service.create_feed_subscription, subscription.model_dump())
+        # The store assigns its own id, point the articles at it so feed toggles apply to them
+        feed_id = created_sub.id if created_sub else subscription.id
         for a in articles:
             a.user_id = current_user["id"]
-        created_sub = hybrid_service.create_feed_subscription(subscription.dict())
-        for a in articles:
-            hybrid_service.create_article(a.dict())
+            a.feed_id = feed_id
+        # One batched insert instead of a round-trip per article
+        await run_in_threadpool(hybrid_service.create_articles, [a.model_dump() for a in articles])
         
         return {
             "message": "Feed added successfully",
@@ -618,90 +742,114 @@ def delete_feed_subscription(subscription_id: str, current_user: dict = Depends(
 @app.post("/api/feeds/subscriptions/{subscription_id}/toggle")
 def toggle_feed_subscription(subscription_id: str, toggle_data: dict, current_user: dict = Depends(get_current_user)):
     """Toggle feed subscription active status"""
-    # Fetch, then update via database
-    subs = hybrid_service.get_all_feed_subscriptions(user_id=current_user["id"])
-    subscription = next((s for s in subs if s.id == subscription_id), None)
+    # Direct lookup by id, then update that row in place
+    subscription = hybrid_service.get_feed_subscription(subscription_id)
+    if not subscription or (subscription.user_id and subscription.user_id != current_user["id"]):
+        raise HTTPException(status_code=404, detail="Feed subscription not found")
+    is_active = toggle_data.get('is_active', not subscription.is_active)
+    subscription = hybrid_service.update_feed_subscription(subscription_id, {'is_active': is_active})
     if not subscription:
         raise HTTPException(status_code=404, detail="Feed subscription not found")
-    subscription.is_active = toggle_data.get('is_active', not subscription.is_active)
-    hybrid_service.create_feed_subscription(subscription.dict())  # upsert behavior via hybrid path
     return {
         "message": f"Feed subscription {'activated' if subscription.is_active else 'deactivated'} successfully",
         "is_active": subscription.is_active
     }
 
-@app.post("/api/feeds/refresh")
-def refresh_feeds(current_user: dict = Depends(get_current_user)):
-    """Manually refresh all feeds for the current user"""
-    try:
-        # Re-parse each active feed for this user and store new articles
-        subscriptions = hybrid_service.get_all_feed_subscriptions(user_id=current_user["id"])
-        total = 0
-        for sub in [s for s in subscriptions if s.is_active]:
-            _, new_articles = parse_rss_feed(sub.url, sub.title)
-            for a in new_articles:
-                a.user_id = current_user["id"]
-                a.feed_id = sub.id
-                hybrid_service.create_article(a.dict())
-                total += 1
-        return {"message": "Feeds refreshed successfully", "total_articles": total}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to refresh feeds: {str(e)}")
+async def refresh_user_feeds(user_id: str, store=hybrid_service) -> int:
+    """Re-fetch every active feed for a user concurrently and store new articles through store"""
+    subscriptions = await run_in_threadpool(store.get_all_feed_subscriptions, user_id=user_id)
+    # The local fallback returns every stored feed, so keep only this user's
+    active = [s for s in subscriptions if s.is_active and s.user_id == user_id]
+    
+    # Built once and kept current so re-fetched and cross-feed duplicates are skipped
+    existing_urls = await run_in_threadpool(store.get_article_urls, user_id)
+    added_articles = []
+    refreshed_at = datetime.now().isoformat()
+    for sub, result in zip(active, await fetch_rss_feeds(active)):
+        if isinstance(result, Exception):
+            log.warning("Failed to refresh feed %s: %s", sub.title, result)
+            continue
+        # Only the refresh fields of this one subscription are written, so feeds
+        # added or removed while the fetches were in flight are left alone
+        refresh_fields = {'last_updated': refreshed_at}
+        if result is None:
+            await run_in_threadpool(store.update_feed_subscription, sub.id, refresh_fields)
+            continue  # 304 Not Modified
+        fetched, new_articles = result
+        # Keep the validators for the next conditional GET
+        refresh_fields['etag'] = fetched.etag
+        refresh_fields['last_modified'] = fetched.last_modified
+        await run_in_threadpool(store.update_feed_subscription, sub.id, refresh_fields)
+        for a in new_articles:
+            if a.url and a.url in existing_urls:
+                continue
+            existing_urls.add(a.url)
+            a.user_id = user_id
+            a.feed_id = sub.id
+            added_articles.append(a.model_dump())
+    
+    # Single batched write for everything that is new
+    if added_articles:
+        await run_in_threadpool(store.create_articles, added_articles)
+    return len(added_articles)
+
+@app.post("/api/feeds/refresh", status_code=202)
+async def refresh_feeds(background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
+    """Schedule a refresh of all feeds for the current user; clients poll GET /api/feeds"""
+    # The task runs after the response, when the shared client may carry another user's JWT,
+    # so it gets a client of its own under this user's token
+    store = DatabaseService(create_user_supabase(current_user["token"])) if hybrid_service.use_database else local_feed_store
+    background_tasks.add_task(refresh_user_feeds, current_user["id"], store)
+    return {"message": "Feed refresh scheduled"}
 
 @app.get("/api/feeds/search/{query}")
-def search_articles(query: str, current_user: dict = Depends(get_current_user)):
+def search_articles(query: str, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
     """Search articles by title, content, or tags for current user"""
-    articles = hybrid_service.get_all_articles(user_id=current_user["id"])
-    query_lower = query.lower()
-    
-    matching_articles = []
-    for article in articles:
-        if (query_lower in article.title.lower() or 
-            query_lower in article.snippet.lower() or
-            query_lower in (article.content or "").lower() or
-            any(query_lower in tag.lower() for tag in (article.tags or []))):
-            matching_articles.append(article)
-    
-    return matching_articles
+    return hybrid_service.search_articles(query, user_id=current_user["id"])[offset:offset + limit]
 
 # Document API endpoints
 @app.get("/api/documents", response_model=List[Document])
-def get_all_documents(current_user: dict = Depends(get_current_user)):
-    """Get all uploaded documents for the current user"""
-    documents = hybrid_service.get_all_documents(user_id=current_user["id"])
-    documents.sort(key=lambda x: x.upload_date, reverse=True)
-    return documents
+def get_all_documents(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
+    """Get uploaded documents for the current user, one page at a time"""
+    # Both stores return documents newest-first (ORDER BY upload_date DESC) and page in the query
+    return hybrid_service.get_all_documents(user_id=current_user["id"], limit=limit, offset=offset)
 
 @app.get("/api/documents/{document_id}", response_model=Document)
 def get_document(document_id: str, current_user: dict = Depends(get_current_user)):
     """Get a specific document"""
-    documents = hybrid_service.get_all_documents(user_id=current_user["id"])
-    document = next((d for d in documents if d.id == document_id), None)
+    document = hybrid_service.get_document(document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
+    # RLS prevents cross-user reads from DB; add explicit check for the local fallback
+    if document.user_id and document.user_id != current_user["id"]:
+        raise HTTPException(status_code=404, detail="Document not found")
     return document
 
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+
 @app.post("/api/documents/upload", response_model=Document)
-def upload_document(file: UploadFile = File(...), name: str = Form(...), current_user: dict = Depends(get_current_user)):
+async def upload_document(background_tasks: BackgroundTasks, file: UploadFile = File(...), name: str = Form(...), current_user: dict = Depends(get_current_user)):
     """Upload and process a document"""
     # Validate file type
     if file.content_type not in ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
     
-    # Validate file size (10MB limit)
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
+    # Reject oversized uploads from the parsed part size before pulling them into memory
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File size must be less than 10MB")
+    
+    # Read without blocking the event loop, then validate file size (10MB limit)
+    file_content = await file.read()
     
-    if file_size > 10 * 1024 * 1024:  # 10MB
+    if len(file_content) > MAX_UPLOAD_BYTES:
         raise HTTPException(status_code=400, detail="File size must be less than 10MB")
     
     try:
-        # Process the document
-        document = process_document(file)
+        # Text extraction and the storage write are blocking, keep them off the event loop
+        document = await run_in_threadpool(process_document, file_content, file.filename, file.content_type)
         
         # Persist via database-first hybrid service with user scoping
-        created = hybrid_service.create_document({
+        created = await run_in_threadpool(hybrid_service.create_document, {
             'name': document.name,
             'type': document.type,
             'size': document.size,
@@ -709,6 +857,8 @@ def upload_document(file: UploadFile = File(...), name: str = Form(...), current
             'status': document.status,
             'user_id': current_user["id"]
         })
+        if keyword_service.note_corpus_insert():
+            background_tasks.add_task(keyword_service.fit_corpus_vectorizer)
         return created or document
         
     except Exception as e:
@@ -722,26 +872,375 @@ def delete_document(document_id: str, current_user: dict = Depends(get_current_u
     return {"message": "Document deleted successfully"}
 
 @app.get("/api/documents/search/{query}")
-def search_documents(query: str, current_user: dict = Depends(get_current_user)):
+def search_documents(query: str, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), current_user: dict = Depends(get_current_user)):
     """Search documents by name or content"""
-    documents = hybrid_service.get_all_documents(user_id=current_user["id"])
-    query_lower = query.lower()
+    return hybrid_service.search_documents(query, user_id=current_user["id"])[offset:offset + limit]
+
+def paper_search_cache(maxsize: int = 1024, ttl: float = 600):
+    """
+    LRU + TTL cache for a paper source coroutine, keyed on the normalized (q, top_k).
+    Concurrent misses for the same key share one upstream call. Empty results are
+    not cached, since sources also return [] when the upstream call fails.
+    """
+    def decorator(fetch):
+        entries: "OrderedDict[tuple, tuple[float, List[dict]]]" = OrderedDict()
+        in_flight: Dict[tuple, asyncio.Task] = {}
+        
+        def cache_key(q: str, top_k: int) -> tuple:
+            return (q.strip().lower(), top_k)
+        
+        def lookup(key: tuple) -> Optional[List[dict]]:
+            entry = entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                entries.move_to_end(key)
+                return entry[1]
+            return None
+        
+        @wraps(fetch)
+        async def wrapper(q: str, top_k: int) -> List[dict]:
+            key = cache_key(q, top_k)
+            cached = lookup(key)
+            if cached is not None:
+                return cached
+            
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fetch(q, top_k))
+                in_flight[key] = task
+                task.add_done_callback(lambda _: in_flight.pop(key, None))
+            # Shielded so one cancelled caller doesn't cancel the fetch for the others
+            results = await asyncio.shield(task)
+            if results:
+                entries[key] = (time.monotonic() + ttl, results)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return results
+        
+        wrapper.is_cached = lambda q, top_k: lookup(cache_key(q, top_k)) is not None
+        return wrapper
+    return decorator
+
+# Academic paper sources, each returning a list of normalized result dicts
+
+# Caps on concurrent requests per upstream host; NCBI throttles keyless clients at ~3 req/s
+PUBMED_SEM = asyncio.Semaphore(3)
+# PMIDs per efetch request; larger result sets are split and fetched in parallel
+PUBMED_EFETCH_CHUNK = 20
+ARXIV_SEM = asyncio.Semaphore(5)
+
+# Summary length kept per paper; cut at parse time so cached results don't hold whole abstracts
+PAPER_SUMMARY_CHARS = 500
+
+# Source endpoints; query strings are passed as params= and encoded by httpx
+SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+OPENALEX_WORKS_URL = "https://api.openalex.org/works"
+ARXIV_QUERY_URL = "https://export.arxiv.org/api/query"
+PUBMED_ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+PUBMED_EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+
+@paper_search_cache()
+async def search_semantic_scholar(q: str, top_k: int) -> List[dict]:
+    """Search Semantic Scholar and return normalized paper dicts"""
+    results = []
+    # Semantic Scholar API
+    try:
+        r = await http_client.get(SEMANTIC_SCHOLAR_SEARCH_URL, params={
+            "query": q,
+            "limit": top_k,
+            "fields": "title,url,abstract,year,publicationDate"
+        })
+        if r.status_code == 200:
+            data = r.json()
+            for paper in data.get("data", []):
+                abstract = paper.get("abstract") or ""
+                title = paper.get("title") or "Untitled"
+                link = paper.get("url") or ""
+                year = paper.get("year")
+                pub_date = paper.get("publicationDate")  # ISO date string if provided
+                normalized_date = pub_date or (str(year) if year else "")
+                results.append({
+                    "title": title,
+                    "summary": abstract[:PAPER_SUMMARY_CHARS],
+                    "link": link,
+                    "source": "Semantic Scholar",
+                    "date": normalized_date
+                })
+    except Exception as e:
+        log.warning("Semantic Scholar error: %s", e)
+    return results
+
+def openalex_abstract(inverted_index: dict) -> str:
+    """Rebuild an OpenAlex abstract by placing each word at its positions (no sort)"""
+    size = max((max(positions) for positions in inverted_index.values() if positions), default=-1) + 1
+    words = [""] * size
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            words[pos] = word
+    return " ".join(w for w in words if w)
+
+@paper_search_cache()
+async def search_openalex(q: str, top_k: int) -> List[dict]:
+    """Search OpenAlex and return normalized paper dicts"""
+    results = []
+    # OpenAlex API - following their best practices
+    try:
+        # Use proper email for polite pool and better rate limits
+        r = await http_client.get(OPENALEX_WORKS_URL, params={
+            "search": q,
+            "per_page": top_k,
+            "mailto": "readnest@example.com"
+        })
+        log.debug("OpenAlex URL: %s", r.url)
+        log.debug("OpenAlex response status: %s", r.status_code)
+        if r.status_code == 200:
+            data = r.json()
+            log.debug("OpenAlex found %d results", len(data.get('results', [])))
+            for work in data.get("results", []):
+                # Extract abstract - OpenAlex uses abstract_inverted_index format
+                abstract_text = ""
+                if work.get("abstract_inverted_index"):
+                    # Convert inverted index to readable text
+                    abstract_text = openalex_abstract(work["abstract_inverted_index"])
+                elif work.get("abstract"):
+                    # Fallback to direct abstract if available
+                    abstract_text = work["abstract"]
+
+                title = work.get("title", "Untitled")
+
+                # Get best available link following OpenAlex priority
+                link = ""
+                if work.get("open_access", {}).get("oa_url"):
+                    # Open access PDF link (best option)
+                    link = work["open_access"]["oa_url"]
+                elif work.get("primary_location", {}).get("landing_page_url"):
+                    # Publisher landing page
+                    link = work["primary_location"]["landing_page_url"]
+                elif work.get("doi"):
+                    # DOI link
+                    link = f"https://doi.org/{work['doi']}"
+                elif work.get("id"):
+                    # OpenAlex page as fallback
+                    link = work["id"]
+
+                # Get publication year and venue information
+                pub_year = work.get("publication_year", "")
+                venue = work.get("primary_location", {}).get("source", {}).get("display_name", "")
+
+                # Create enhanced title with year and venue
+                title_parts = [title]
+                if pub_year:
+                    title_parts.append(f"({pub_year})")
+                if venue:
+                    title_parts.append(f"- {venue}")
+
+                enhanced_title = " ".join(title_parts)
+
+                results.append({
+                    "title": enhanced_title,
+                    "summary": abstract_text[:PAPER_SUMMARY_CHARS] if abstract_text else "No abstract available",
+                    "link": link,
+                    "source": "OpenAlex",
+                    "date": str(pub_year) if pub_year else ""
+                })
+        else:
+            log.warning("OpenAlex error: %s - %s", r.status_code, r.text)
+    except Exception as e:
+        log.exception("OpenAlex error: %s", e)
+    return results
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+ATOM_NAMESPACES = {"atom": "http://www.w3.org/2005/Atom"}
+
+# Compiled once instead of re-parsing the path on every entry; smart_strings=False yields
+# plain str results that don't keep the parsed tree alive
+def atom_xpath(path: str) -> etree.XPath:
+    return etree.XPath(path, namespaces=ATOM_NAMESPACES, smart_strings=False)
+
+ATOM_TITLE_XP = atom_xpath("string(atom:title)")
+ATOM_SUMMARY_XP = atom_xpath("string(atom:summary)")
+ATOM_ID_XP = atom_xpath("string(atom:id)")
+ATOM_PUBLISHED_XP = atom_xpath("string(atom:published)")
+ATOM_AUTHOR_NAMES_XP = atom_xpath("atom:author/atom:name/text()")
+
+def parse_arxiv_entries(content: bytes) -> List[dict]:
+    """Stream Atom entries out of an arXiv response, freeing each one once read"""
+    results = []
+    for _, entry in etree.iterparse(io.BytesIO(content), tag=f'{ATOM_NS}entry'):
+        title = ATOM_TITLE_XP(entry).strip() or "Untitled"
+        summary = ATOM_SUMMARY_XP(entry).strip() or "No abstract available"
+        
+        # Extract arXiv ID from URL like "http://arxiv.org/abs/hep-ex/0307015"
+        entry_id = ATOM_ID_XP(entry)
+        arxiv_id = entry_id.split('/')[-1] if entry_id else ""
+        link = f"http://arxiv.org/abs/{arxiv_id}" if arxiv_id else ""
+        
+        # Prefer full date (YYYY-MM-DD) if present
+        published = ATOM_PUBLISHED_XP(entry)
+        pub_date = published[:10] if published else ""
+        year_suffix = f" ({pub_date[:4]})" if pub_date else ""
+        
+        authors = [name.strip() for name in ATOM_AUTHOR_NAMES_XP(entry) if name.strip()]
+        author_text = f" by {', '.join(authors[:3])}" if authors else ""
+        if len(authors) > 3:
+            author_text += " et al."
+        
+        results.append({
+            "title": title + year_suffix + author_text,
+            "summary": summary[:PAPER_SUMMARY_CHARS],
+            "link": link,
+            "source": "arXiv",
+            "date": pub_date
+        })
+        entry.clear()
+    return results
+
+@paper_search_cache()
+async def search_arxiv(q: str, top_k: int) -> List[dict]:
+    """Search arXiv and return normalized paper dicts"""
+    results = []
+    # arXiv API (no key required) - using correct URL format
+    try:
+        # Use HTTPS for arXiv API
+        async with ARXIV_SEM:
+            r = await http_client.get(ARXIV_QUERY_URL, params={
+                "search_query": f"all:{q}",
+                "start": 0,
+                "max_results": top_k,
+                "sortBy": "relevance",
+                "sortOrder": "descending"
+            })
+        log.debug("arXiv URL: %s", r.url)
+        log.debug("arXiv response status: %s", r.status_code)
+        if r.status_code == 200:
+            results = parse_arxiv_entries(r.content)
+            log.debug("arXiv found %d results", len(results))
+        else:
+            log.warning("arXiv error: %s - %s", r.status_code, r.text)
+    except Exception as e:
+        log.exception("arXiv error: %s", e)
+    return results
+
+PUBMED_MONTHS = {
+    "Jan": "01", "Feb": "02", "Mar": "03", "Apr": "04", "May": "05", "Jun": "06",
+    "Jul": "07", "Aug": "08", "Sep": "09", "Oct": "10", "Nov": "11", "Dec": "12"
+}
+
+# Descendant lookups compiled once; string() of the first match also keeps text inside
+# inline markup such as <i> or <sup>, which findtext() cut off
+PUBMED_TITLE_XP = etree.XPath("string((.//ArticleTitle)[1])", smart_strings=False)
+PUBMED_ABSTRACT_XP = etree.XPath("string((.//AbstractText)[1])", smart_strings=False)
+PUBMED_PMID_XP = etree.XPath("string((.//PMID)[1])", smart_strings=False)
+PUBMED_PUBDATE_XP = etree.XPath("(.//PubDate)[1]")
+
+def parse_pubmed_article(article) -> dict:
+    """Normalize one <PubmedArticle> element into a paper dict"""
+    title = PUBMED_TITLE_XP(article) or "Untitled"
+    abstract = PUBMED_ABSTRACT_XP(article) or "No abstract available"
     
-    matching_documents = []
-    for document in documents:
-        if (query_lower in document.name.lower() or 
-            query_lower in (document.content or "").lower()):
-            matching_documents.append(document)
+    pmid = PUBMED_PMID_XP(article)
+    link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else ""
     
-    return matching_documents
+    # Get publication date (best-effort)
+    pub_date_elems = PUBMED_PUBDATE_XP(article)
+    pub_year = month = day = None
+    if pub_date_elems:
+        pub_date_elem = pub_date_elems[0]
+        pub_year = pub_date_elem.findtext('Year')
+        month = pub_date_elem.findtext('Month')
+        day = pub_date_elem.findtext('Day')
+    pub_year = pub_year or ""
+    # Normalize month text (could be Jan/01/etc.)
+    month = month or "01"
+    day = day or "01"
+    month_norm = PUBMED_MONTHS.get(month, month.zfill(2)) if pub_year else ""
+    pub_date = f"{pub_year}-{month_norm}-{day.zfill(2)}" if pub_year else ""
+    year_suffix = f" ({pub_year})" if pub_year else ""
+    
+    return {
+        "title": title + year_suffix,
+        "summary": abstract[:PAPER_SUMMARY_CHARS],
+        "link": link,
+        "source": "PubMed",
+        "date": pub_date or (pub_year or "")
+    }
+
+def drain_pubmed_events(parser) -> List[dict]:
+    """Normalize the <PubmedArticle> elements completed so far, then free them"""
+    results = []
+    for _, article in parser.read_events():
+        results.append(parse_pubmed_article(article))
+        # Drop the finished article and its already-processed siblings
+        article.clear()
+        while article.getprevious() is not None:
+            del article.getparent()[0]
+    return results
+
+async def stream_pubmed_articles(pmids: List[str]) -> List[dict]:
+    """Stream an efetch response for the given PMIDs into an lxml pull parser, one article in memory at a time"""
+    results = []
+    params = {"db": "pubmed", "id": ",".join(pmids), "retmode": "xml"}
+    async with PUBMED_SEM, http_client.stream("GET", PUBMED_EFETCH_URL, params=params) as response:
+        if response.status_code != 200:
+            log.warning("PubMed efetch error: %s", response.status_code)
+            return results
+        parser = etree.XMLPullParser(events=("end",), tag="PubmedArticle")
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+            results.extend(drain_pubmed_events(parser))
+        parser.close()
+        results.extend(drain_pubmed_events(parser))
+    return results
+
+@paper_search_cache()
+async def search_pubmed(q: str, top_k: int) -> List[dict]:
+    """Search PubMed and return normalized paper dicts"""
+    results = []
+    # PubMed API (no key required for basic search)
+    try:
+        # First search for PMIDs
+        async with PUBMED_SEM:
+            r = await http_client.get(PUBMED_ESEARCH_URL, params={
+                "db": "pubmed",
+                "term": q,
+                "retmax": top_k,
+                "retmode": "json"
+            })
+        log.debug("PubMed search URL: %s", r.url)
+        if r.status_code == 200:
+            search_data = r.json()
+            pmids = search_data.get("esearchresult", {}).get("idlist", [])
+            log.debug("PubMed found %d PMIDs", len(pmids))
+
+            if pmids:
+                # Get details in chunks of PMIDs, fetched concurrently (PUBMED_SEM caps the fan-out)
+                chunks = [pmids[i:i + PUBMED_EFETCH_CHUNK] for i in range(0, len(pmids), PUBMED_EFETCH_CHUNK)]
+                fetched = await asyncio.gather(
+                    *(stream_pubmed_articles(chunk) for chunk in chunks),
+                    return_exceptions=True
+                )
+                for chunk_results in fetched:
+                    if isinstance(chunk_results, Exception):
+                        log.warning("PubMed efetch chunk failed: %s", chunk_results)
+                        continue
+                    results.extend(chunk_results)
+    except Exception as e:
+        log.exception("PubMed error: %s", e)
+    return results
+
+PAPER_SOURCES = {
+    "semantic_scholar": search_semantic_scholar,
+    "openalex": search_openalex,
+    "arxiv": search_arxiv,
+    "pubmed": search_pubmed,
+}
 
 @app.get("/api/search")
-async def search_papers(q: str = Query(...), top_k: int = 5, source: str = "semantic_scholar"):
+async def search_papers(response: Response, q: str = Query(...), top_k: int = 5, source: str = "semantic_scholar"):
     """
     Search for papers using multiple academic APIs.
     Sources: semantic_scholar, openalex, arxiv, pubmed
     """
-    results = []
 
     # Helper to normalize date strings for sorting
     def to_sortable_date(date_str: str):
@@ -759,245 +1258,27 @@ async def search_papers(q: str = Query(...), top_k: int = 5, source: str = "sema
         except Exception:
             return None
     
-    if source == "semantic_scholar" or source == "all":
-        # Semantic Scholar API
-        try:
-            url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={q}&limit={top_k}&fields=title,url,abstract,year,publicationDate"
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url)
-                if r.status_code == 200:
-                    data = r.json()
-                    for paper in data.get("data", []):
-                        abstract = paper.get("abstract") or ""
-                        title = paper.get("title") or "Untitled"
-                        link = paper.get("url") or ""
-                        year = paper.get("year")
-                        pub_date = paper.get("publicationDate")  # ISO date string if provided
-                        normalized_date = pub_date or (str(year) if year else "")
-                        results.append({
-                            "title": title,
-                            "summary": abstract[:500],
-                            "link": link,
-                            "source": "Semantic Scholar",
-                            "date": normalized_date
-                        })
-        except Exception as e:
-            print(f"Semantic Scholar error: {e}")
-    
-    if source == "openalex" or source == "all":
-        # OpenAlex API - following their best practices
-        try:
-            import urllib.parse
-            encoded_query = urllib.parse.quote(q)
-            # Use proper email for polite pool and better rate limits
-            url = f"https://api.openalex.org/works?search={encoded_query}&per_page={top_k}&mailto=readnest@example.com"
-            print(f"OpenAlex URL: {url}")
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url)
-                print(f"OpenAlex response status: {r.status_code}")
-                if r.status_code == 200:
-                    data = r.json()
-                    print(f"OpenAlex found {len(data.get('results', []))} results")
-                    for work in data.get("results", []):
-                        # Extract abstract - OpenAlex uses abstract_inverted_index format
-                        abstract_text = ""
-                        if work.get("abstract_inverted_index"):
-                            # Convert inverted index to readable text
-                            abstract = work["abstract_inverted_index"]
-                            words = []
-                            for word, positions in abstract.items():
-                                for pos in positions:
-                                    words.append((pos, word))
-                            words.sort()
-                            abstract_text = " ".join([word for pos, word in words])
-                        elif work.get("abstract"):
-                            # Fallback to direct abstract if available
-                            abstract_text = work["abstract"]
-                        
-                        title = work.get("title", "Untitled")
-                        
-                        # Get best available link following OpenAlex priority
-                        link = ""
-                        if work.get("open_access", {}).get("oa_url"):
-                            # Open access PDF link (best option)
-                            link = work["open_access"]["oa_url"]
-                        elif work.get("primary_location", {}).get("landing_page_url"):
-                            # Publisher landing page
-                            link = work["primary_location"]["landing_page_url"]
-                        elif work.get("doi"):
-                            # DOI link
-                            link = f"https://doi.org/{work['doi']}"
-                        elif work.get("id"):
-                            # OpenAlex page as fallback
-                            link = work["id"]
-                        
-                        # Get publication year and venue information
-                        pub_year = work.get("publication_year", "")
-                        venue = work.get("primary_location", {}).get("source", {}).get("display_name", "")
-                        
-                        # Create enhanced title with year and venue
-                        title_parts = [title]
-                        if pub_year:
-                            title_parts.append(f"({pub_year})")
-                        if venue:
-                            title_parts.append(f"- {venue}")
-                        
-                        enhanced_title = " ".join(title_parts)
-                        
-                        results.append({
-                            "title": enhanced_title,
-                            "summary": abstract_text[:500] if abstract_text else "No abstract available",
-                            "link": link,
-                            "source": "OpenAlex",
-                            "date": str(pub_year) if pub_year else ""
-                        })
-                else:
-                    print(f"OpenAlex error: {r.status_code} - {r.text}")
-        except Exception as e:
-            print(f"OpenAlex error: {e}")
-            import traceback
-            traceback.print_exc()
+    # Query the selected sources concurrently over the shared client
+    fetchers = [
+        fetch for name, fetch in PAPER_SOURCES.items()
+        if source == name or source == "all"
+    ]
+    # HIT only when every selected source is answered from the cache
+    response.headers["X-Cache"] = "HIT" if fetchers and all(f.is_cached(q, top_k) for f in fetchers) else "MISS"
+    results = []
+    for source_results in await asyncio.gather(*(fetch(q, top_k) for fetch in fetchers), return_exceptions=True):
+        if isinstance(source_results, Exception):
+            log.warning("Paper search source failed: %s", source_results)
+            continue
+        results.extend(source_results)
     
-    if source == "arxiv" or source == "all":
-        # arXiv API (no key required) - using correct URL format
-        try:
-            # Use HTTPS and proper URL encoding for arXiv API
-            import urllib.parse
-            encoded_query = urllib.parse.quote(f"all:{q}")
-            url = f"https://export.arxiv.org/api/query?search_query={encoded_query}&start=0&max_results={top_k}&sortBy=relevance&sortOrder=descending"
-            print(f"arXiv URL: {url}")
-            async with httpx.AsyncClient() as client:
-                r = await client.get(url)
-                print(f"arXiv response status: {r.status_code}")
-                if r.status_code == 200:
-                    # Parse XML response using the correct namespace
-                    from xml.etree import ElementTree as ET
-                    root = ET.fromstring(r.text)
-                    
-                    # Find all entries using the correct namespace
-                    entries = root.findall('.//{http://www.w3.org/2005/Atom}entry')
-                    print(f"arXiv found {len(entries)} results")
-                    
-                    for entry in entries:
-                        # Extract title
-                        title_elem = entry.find('.//{http://www.w3.org/2005/Atom}title')
-                        title = title_elem.text.strip() if title_elem is not None and title_elem.text else "Untitled"
-                        
-                        # Extract summary/abstract
-                        summary_elem = entry.find('.//{http://www.w3.org/2005/Atom}summary')
-                        summary = summary_elem.text.strip() if summary_elem is not None and summary_elem.text else "No abstract available"
-                        
-                        # Extract arXiv ID and create proper link
-                        id_elem = entry.find('.//{http://www.w3.org/2005/Atom}id')
-                        arxiv_id = ""
-                        if id_elem is not None and id_elem.text:
-                            # Extract arXiv ID from URL like "http://arxiv.org/abs/hep-ex/0307015"
-                            arxiv_id = id_elem.text.split('/')[-1]
-                        
-                        # Create proper arXiv link
-                        link = f"http://arxiv.org/abs/{arxiv_id}" if arxiv_id else ""
-                        
-                        # Get publication date
-                        published_elem = entry.find('.//{http://www.w3.org/2005/Atom}published')
-                        pub_date = ""
-                        if published_elem is not None and published_elem.text:
-                            # Prefer full date (YYYY-MM-DD) if present
-                            full_date = published_elem.text[:10]
-                            pub_date = full_date
-                        year_suffix = f" ({pub_date[:4]})" if pub_date else ""
-                        
-                        # Get authors
-                        authors = []
-                        for author in entry.findall('.//{http://www.w3.org/2005/Atom}author'):
-                            name_elem = author.find('.//{http://www.w3.org/2005/Atom}name')
-                            if name_elem is not None and name_elem.text:
-                                authors.append(name_elem.text.strip())
-                        
-                        author_text = f" by {', '.join(authors[:3])}" if authors else ""
-                        if len(authors) > 3:
-                            author_text += f" et al."
-                        
-                        results.append({
-                            "title": title + year_suffix + author_text,
-                            "summary": summary[:500],
-                            "link": link,
-                            "source": "arXiv",
-                            "date": pub_date
-                        })
-                else:
-                    print(f"arXiv error: {r.status_code} - {r.text}")
-        except Exception as e:
-            print(f"arXiv error: {e}")
-            import traceback
-            traceback.print_exc()
+    # Sort results by date descending (newest first); items without date go last.
+    # Each date is parsed once per result rather than twice per comparison key.
+    def date_sort_key(result: dict):
+        parsed = to_sortable_date(result.get("date"))
+        return (parsed is not None, parsed or datetime.min)
     
-    if source == "pubmed" or source == "all":
-        # PubMed API (no key required for basic search)
-        try:
-            # First search for PMIDs
-            import urllib.parse
-            encoded_query = urllib.parse.quote(q)
-            search_url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi?db=pubmed&term={encoded_query}&retmax={top_k}&retmode=json"
-            print(f"PubMed search URL: {search_url}")
-            async with httpx.AsyncClient() as client:
-                r = await client.get(search_url)
-                if r.status_code == 200:
-                    search_data = r.json()
-                    pmids = search_data.get("esearchresult", {}).get("idlist", [])
-                    print(f"PubMed found {len(pmids)} PMIDs")
-                    
-                    if pmids:
-                        # Get details for each PMID
-                        pmids_str = ",".join(pmids)
-                        fetch_url = f"https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?db=pubmed&id={pmids_str}&retmode=xml"
-                        
-                        r2 = await client.get(fetch_url)
-                        if r2.status_code == 200:
-                            # Parse XML response
-                            from xml.etree import ElementTree as ET
-                            root = ET.fromstring(r2.text)
-                            
-                            articles = root.findall('.//PubmedArticle')
-                            for article in articles:
-                                title_elem = article.find('.//ArticleTitle')
-                                title = title_elem.text if title_elem is not None else "Untitled"
-                                
-                                abstract_elem = article.find('.//AbstractText')
-                                abstract = abstract_elem.text if abstract_elem is not None else "No abstract available"
-                                
-                                pmid_elem = article.find('.//PMID')
-                                pmid = pmid_elem.text if pmid_elem is not None else ""
-                                link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else ""
-                                
-                                # Get publication date (best-effort)
-                                year_elem = article.find('.//PubDate/Year')
-                                month_elem = article.find('.//PubDate/Month')
-                                day_elem = article.find('.//PubDate/Day')
-                                pub_year = year_elem.text if year_elem is not None else ""
-                                # Normalize month text (could be Jan/01/etc.)
-                                month = month_elem.text if month_elem is not None else "01"
-                                day = day_elem.text if day_elem is not None else "01"
-                                # Map short month names to numbers
-                                month_map = {"Jan":"01","Feb":"02","Mar":"03","Apr":"04","May":"05","Jun":"06","Jul":"07","Aug":"08","Sep":"09","Oct":"10","Nov":"11","Dec":"12"}
-                                month_norm = month_map.get(month, month.zfill(2)) if pub_year else ""
-                                pub_date = f"{pub_year}-{month_norm}-{day.zfill(2)}" if pub_year else ""
-                                year_suffix = f" ({pub_year})" if pub_year else ""
-                                
-                                results.append({
-                                    "title": title + year_suffix,
-                                    "summary": abstract[:500],
-                                    "link": link,
-                                    "source": "PubMed",
-                                    "date": pub_date or (pub_year or "")
-                                })
-        except Exception as e:
-            print(f"PubMed error: {e}")
-            import traceback
-            traceback.print_exc()
-
-    # Sort results by date descending (newest first); items without date go last
-    results.sort(key=lambda r: (to_sortable_date(r.get("date")) is None, to_sortable_date(r.get("date")) or datetime.min), reverse=False)
-    results.reverse()
+    results.sort(key=date_sort_key, reverse=True)
 
     return {"results": results}
 
@@ -1007,8 +1288,8 @@ async def run_scholar_agent(payload: dict):
     payload: {"user_prompt": "...", "papers": [...]}
     """
     try:
-        # invoke the compiled graph
-        result = scholar_agent.invoke({
+        # invoke the compiled graph without blocking the event loop
+        result = await scholar_agent.ainvoke({
             "user_prompt": payload.get("user_prompt", ""),
             "papers": payload.get("papers", [])
         })
@@ -1027,80 +1308,106 @@ async def run_scholar_agent(payload: dict):
                 return {"results": [], "raw": str(result)}
 
     except Exception as e:
-        tb = traceback.format_exc()
-        print("scholar_agent endpoint error:", tb)
+        log.exception("scholar_agent endpoint error")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Chat model built once at import (same Groq setup as scholar_agent) and shared by all requests
+LLM_CHAT = ChatGroq(
+    model="llama-3.1-8b-instant",
+    temperature=0.7,
+    groq_api_key=os.getenv("GROQ_API_KEY"),
+)
+
 class ChatRequest(BaseModel):
     message: str
     conversation_history: List[dict] = []
 
+async def build_chat_context(request: ChatRequest, user_id: str) -> str:
+    """Prompt for the chat model: instructions, recent notes, history and the new message"""
+    # Fetch user's journal entries for context
+    notes_context = ""
+    try:
+        journals = await run_in_threadpool(hybrid_service.get_all_journals, user_id=user_id)
+        if journals:
+            # Include recent notes (last 5 entries, truncated)
+            recent_notes = journals[:5]
+            notes_summary = "\n".join([
+                f"- {entry.title}: {entry.content[:200]}..." if len(entry.content) > 200 else f"- {entry.title}: {entry.content}"
+                for entry in recent_notes
+            ])
+            notes_context = f"\n\nYou have access to the user's notes/journal entries. Here are their recent notes:\n{notes_summary}\n"
+    except Exception as e:
+        log.warning("Error fetching notes for context: %s", e)
+        notes_context = ""
+    
+    # Build conversation context
+    conversation_context = "You are a helpful AI assistant for ReadNest, a reading and research platform. You can help with general questions, explanations, creative tasks, and casual conversation. " + \
+                          "You also have access to the user's notes and journal entries, which you can reference when relevant to answer their questions." + \
+                          "Be friendly, informative, and concise.\n\n"
+    
+    # Add notes context if available
+    if notes_context:
+        conversation_context += notes_context
+    
+    # Add conversation history (last 10 messages)
+    for msg in request.conversation_history[-10:]:
+        if msg.get('role') == 'user':
+            conversation_context += f"User: {msg['content']}\n"
+        elif msg.get('role') == 'assistant':
+            conversation_context += f"Assistant: {msg['content']}\n"
+    
+    # Add current message
+    conversation_context += f"User: {request.message}\nAssistant:"
+    return conversation_context
+
 @app.post("/api/chat")
 async def chat_with_ai(request: ChatRequest, current_user: dict = Depends(get_current_user)):
     """
     AI chat endpoint with access to user's notes/journals for context
     """
     try:
-        from langchain_groq import ChatGroq
-        
-        # Initialize Groq client using langchain_groq (same as scholar_agent)
-        llm = ChatGroq(
-            model="llama-3.1-8b-instant",
-            temperature=0.7,
-            groq_api_key=os.getenv("GROQ_API_KEY"),
-        )
-        
-        # Fetch user's journal entries for context
-        notes_context = ""
-        try:
-            journals = hybrid_service.get_all_journals(user_id=current_user["id"])
-            if journals:
-                # Include recent notes (last 5 entries, truncated)
-                recent_notes = journals[:5]
-                notes_summary = "\n".join([
-                    f"- {entry.title}: {entry.content[:200]}..." if len(entry.content) > 200 else f"- {entry.title}: {entry.content}"
-                    for entry in recent_notes
-                ])
-                notes_context = f"\n\nYou have access to the user's notes/journal entries. Here are their recent notes:\n{notes_summary}\n"
-        except Exception as e:
-            print(f"Error fetching notes for context: {e}")
-            notes_context = ""
-        
-        # Build conversation context
-        conversation_context = "You are a helpful AI assistant for ReadNest, a reading and research platform. You can help with general questions, explanations, creative tasks, and casual conversation. " + \
-                              "You also have access to the user's notes and journal entries, which you can reference when relevant to answer their questions." + \
-                              "Be friendly, informative, and concise.\n\n"
-        
-        # Add notes context if available
-        if notes_context:
-            conversation_context += notes_context
-        
-        # Add conversation history (last 10 messages)
-        for msg in request.conversation_history[-10:]:
-            if msg.get('role') == 'user':
-                conversation_context += f"User: {msg['content']}\n"
-            elif msg.get('role') == 'assistant':
-                conversation_context += f"Assistant: {msg['content']}\n"
-        
-        # Add current message
-        conversation_context += f"User: {request.message}\nAssistant:"
+        conversation_context = await build_chat_context(request, current_user["id"])
         
         # Get response from Groq
-        response = llm.invoke(conversation_context)
+        response = await LLM_CHAT.ainvoke(conversation_context)
         ai_response = response.content
         
         return {"response": ai_response}
         
     except Exception as e:
-        tb = traceback.format_exc()
-        print("chat endpoint error:", tb)
+        log.exception("chat endpoint error")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/chat/stream")
+async def chat_with_ai_stream(request: ChatRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Same as /api/chat, but streams the reply as Server-Sent Events while Groq generates it.
+    Each event is `data: {"delta": "..."}`; the stream ends with `event: done`.
+    """
+    conversation_context = await build_chat_context(request, current_user["id"])
+    
+    async def events():
+        try:
+            async for chunk in LLM_CHAT.astream(conversation_context):
+                if chunk.content:
+                    yield b"data: " + orjson.dumps({"delta": chunk.content}) + b"\n\n"
+        except Exception as e:
+            log.exception("chat stream error")
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Listed in STREAMING_PATHS, so GZip leaves the events unbuffered
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Auth endpoints (Supabase)
 @app.post("/auth/register")
 def register_user(payload: RegisterRequest):
     try:
-        res = supabase.auth.sign_up({
+        res = get_supabase().auth.sign_up({
             "email": payload.email,
             "password": payload.password
         })
@@ -1117,7 +1424,7 @@ def register_user(payload: RegisterRequest):
 @app.post("/auth/login")
 def login_user(payload: LoginRequest):
     try:
-        res = supabase.auth.sign_in_with_password({
+        res = get_supabase().auth.sign_in_with_password({
             "email": payload.email,
             "password": payload.password
         })
@@ -1137,7 +1444,7 @@ def logout_user():
     try:
         # Attempt to sign out (no-op without a persisted session in this server)
         try:
-            supabase.auth.sign_out()
+            get_supabase().auth.sign_out()
         except Exception:
             pass
         return {"success": True}
@@ -1,15 +1,16 @@
 # scholar_agent.py
+import logging
 import os
-import json
 import traceback
-from dotenv import load_dotenv
+import orjson
+import bootstrap  # noqa: F401 - loads .env (GROQ_API_KEY, optional GROQ_MODEL)
 
 # Groq client wrapper (langchain_groq)
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langgraph.graph import StateGraph, END
 
-load_dotenv()  # loads GROQ_API_KEY, optional GROQ_MODEL
+log = logging.getLogger(__name__)
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
@@ -43,10 +44,55 @@ Respond as a JSON array only, e.g.:
 
 def safe_parse_json(text: str):
     try:
-        return json.loads(text)
+        return orjson.loads(text)
     except Exception:
         return None
 
+def extract_json_array(text: str):
+    """
+    Parse the first balanced [...] in text that holds JSON objects, skipping brackets
+    inside JSON strings. Stray brackets in surrounding prose (e.g. citation markers like
+    [1]) don't swallow or shadow the array, unlike a find/rfind slice.
+    """
+    start = text.find('[')
+    while start != -1:
+        depth = 0
+        in_string = escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == '[':
+                depth += 1
+            elif ch == ']':
+                depth -= 1
+                if depth == 0:
+                    parsed = safe_parse_json(text[start:i + 1])
+                    if isinstance(parsed, list) and any(isinstance(item, dict) for item in parsed):
+                        return parsed
+                    break
+        # Not an array of objects, or never closed (a stray '[' in prose): try the next '['
+        start = text.find('[', start + 1)
+    return None
+
+def normalize_results(items):
+    """Map the LLM's items onto {title, summary, link}, accepting common alternate key names"""
+    return [
+        {
+            "title": item.get("title") or item.get("name") or "Untitled",
+            "summary": item.get("summary") or item.get("abstract") or "",
+            "link": item.get("link") or item.get("url") or ""
+        }
+        for item in items if isinstance(item, dict)
+    ]
+
 def build_fallback_results(papers):
     fallback = []
     for p in papers or []:
@@ -58,51 +104,43 @@ def build_fallback_results(papers):
         fallback.append({"title": title, "summary": summary, "link": link})
     return fallback
 
-def scholar_node(state):
+# Prompt budget: papers sent to the LLM and per-field character caps
+MAX_PROMPT_PAPERS = 20
+MAX_TITLE_CHARS = 200
+MAX_ABSTRACT_CHARS = 800
+
+def trim_papers(papers):
+    """Cap the paper count and field lengths before serializing them into the prompt"""
+    trimmed = []
+    for p in (papers or [])[:MAX_PROMPT_PAPERS]:
+        if not isinstance(p, dict):
+            continue
+        trimmed.append({
+            "title": str(p.get("title") or p.get("name") or "")[:MAX_TITLE_CHARS],
+            "abstract": str(p.get("abstract") or p.get("summary") or p.get("snippet") or "")[:MAX_ABSTRACT_CHARS],
+            "link": str(p.get("link") or p.get("url") or "")
+        })
+    return trimmed
+
+async def scholar_node(state):
     user_prompt = state.get("user_prompt", "")
     papers = state.get("papers", [])
 
-    # stringify (truncate to avoid extremely long input)
-    try:
-        papers_text = json.dumps(papers, ensure_ascii=False, default=str)[:20000]
-    except Exception:
-        papers_text = str(papers)[:20000]
+    # stringify only what the prompt needs, trimmed up front instead of cutting the JSON afterwards
+    papers_text = orjson.dumps(trim_papers(papers)).decode()
 
     formatted = prompt.format(user_prompt=user_prompt, papers=papers_text)
 
     try:
-        response = llm.invoke(formatted)
+        response = await llm.ainvoke(formatted)
         raw = getattr(response, "content", None) or getattr(response, "text", None) or str(response)
         parsed = safe_parse_json(raw)
 
-        # direct parse success
-        if parsed and isinstance(parsed, list):
-            normalized = []
-            for item in parsed:
-                if isinstance(item, dict):
-                    normalized.append({
-                        "title": item.get("title") or item.get("name") or "Untitled",
-                        "summary": item.get("summary") or item.get("abstract") or "",
-                        "link": item.get("link") or item.get("url") or ""
-                    })
-            return {"results": normalized}
-
-        # try to extract JSON array substring
-        start = raw.find('[')
-        end = raw.rfind(']')
-        if start != -1 and end != -1 and end > start:
-            maybe = raw[start:end+1]
-            parsed2 = safe_parse_json(maybe)
-            if parsed2 and isinstance(parsed2, list):
-                normalized = []
-                for item in parsed2:
-                    if isinstance(item, dict):
-                        normalized.append({
-                            "title": item.get("title") or item.get("name") or "Untitled",
-                            "summary": item.get("summary") or item.get("abstract") or "",
-                            "link": item.get("link") or item.get("url") or ""
-                        })
-                return {"results": normalized}
+        # direct parse success, else try to extract a JSON array embedded in prose
+        if not (parsed and isinstance(parsed, list)):
+            parsed = extract_json_array(raw)
+        if parsed:
+            return {"results": normalize_results(parsed)}
 
         # unparseable -> return fallback plus raw for debugging
         fallback = build_fallback_results(papers)
@@ -110,8 +148,7 @@ def scholar_node(state):
 
     except Exception as e:
         tb = traceback.format_exc()
-        print("=== scholar_node exception ===")
-        print(tb)
+        log.exception("scholar_node exception")
         fallback = build_fallback_results(papers)
         return {"error": str(e), "traceback": tb, "results": fallback}
 